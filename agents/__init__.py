@@ -3,13 +3,39 @@ Agents powered by Claude Code SDK
 
 This package contains specialized agents that can perform various development tasks
 using Claude Code SDK integration.
+
+Agent classes are imported lazily on first attribute access (PEP 562), so
+``import agents`` does not pull in the Claude Code SDK or every agent module
+until one of them is actually used.
 """
 
-from .base_agent import BaseAgent
-from .frontend_engineer import FrontendEngineer
-from .backend_engineer import BackendEngineer
-from .testing_engineer import TestingEngineer
-from .engineering_manager import EngineeringManager
-from .product_manager import ProductManager
+import importlib
+
+__all__ = ['AgentProtocol', 'BaseAgent', 'FrontendEngineer', 'BackendEngineer', 'EngineeringManager', 'TestingEngineer', 'ProductManager', 'run_parallel']
+
+# Maps each public name to the submodule that defines it
+_LAZY_IMPORTS = {
+    'AgentProtocol': '.base_agent',
+    'BaseAgent': '.base_agent',
+    'FrontendEngineer': '.frontend_engineer',
+    'BackendEngineer': '.backend_engineer',
+    'EngineeringManager': '.engineering_manager',
+    'TestingEngineer': '.testing_engineer',
+    'ProductManager': '.product_manager',
+    'run_parallel': '.agent_pool',
+}
+
+
+def __getattr__(name):
+    """Import agent classes on first access and cache them in the module namespace"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['BaseAgent', 'FrontendEngineer', 'BackendEngineer', 'EngineeringManager', 'TestingEngineer', 'ProductManager']
+def __dir__():
+    return __all__
@@ -0,0 +1,55 @@
+"""
+Agent Pool - Bounded concurrency for running several agent tasks at once
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+# Upper bound on concurrent SDK sessions, to stay clear of API rate limits
+MAX_PARALLEL_AGENTS = 5
+
+
+async def run_parallel(
+    tasks: Iterable[Awaitable[Dict[str, Any]]],
+    max_parallel: int = MAX_PARALLEL_AGENTS,
+    on_error: Optional[Callable[[int, BaseException], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Await agent tasks concurrently, with at most max_parallel in flight
+
+    Args:
+        tasks: Awaitables that each produce a result dictionary, e.g. agent.execute_task_async(...)
+        max_parallel: Maximum number of tasks running at the same time
+        on_error: Optional hook called with (index, exception) for every task that raised
+
+    Returns:
+        Result dictionaries in the same order as tasks. A task that raised is
+        reported as a failed result instead of aborting the others.
+    """
+    tasks = list(tasks)
+
+    if len(tasks) <= 1:
+        # Nothing to overlap, so skip the semaphore and gather machinery
+        outcomes = []
+        for task in tasks:
+            try:
+                outcomes.append(await task)
+            except Exception as e:
+                outcomes.append(e)
+    else:
+        semaphore = asyncio.Semaphore(max_parallel)
+
+        async def bounded(task: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await task
+
+        outcomes = await asyncio.gather(*(bounded(task) for task in tasks), return_exceptions=True)
+
+    results = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, BaseException):
+            if on_error is not None:
+                on_error(index, outcome)
+            outcome = {'success': False, 'error': str(outcome)}
+        results.append(outcome)
+    return results
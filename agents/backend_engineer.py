@@ -2,48 +2,39 @@
 Backend Engineer Agent - Specialized for backend development tasks
 """
 
-from typing import Dict, Any
-from .base_agent import BaseAgent
-from .utils import get_project_info, format_file_list
+import asyncio
+import logging
+import os
+import subprocess
+import tempfile
+import time
+from typing import Dict, Any, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from .base_agent import BaseAgent, NPM_EXECUTABLE, _terminate_process_group
 
 
-class BackendEngineer(BaseAgent):
-    """
-    Specialized agent for backend development tasks
-    Can create APIs, microservices, databases, and full backend systems
-    """
-    
-    def __init__(self, backend_directory: str = "project/backend", max_turns: int = 100):
-        """
-        Initialize the Backend Engineer agent
-        
-        Args:
-            backend_directory: Directory where backend projects will be created
-            max_turns: Maximum number of turns for Claude Code SDK interactions
-        """
-        super().__init__(backend_directory, max_turns)
-        self.agent_name = "Backend Engineer"
-        self.supported_frameworks = ["FastAPI"]
-        self.supported_databases = ["PostgreSQL", "SQLite"]
-    
-    def get_agent_type(self) -> str:
-        """Return the type/name of this agent"""
-        return "Backend Engineer"
-    
-    def _enhance_prompt(self, task_description: str) -> str:
-        """
-        Enhance the task description with backend-specific context
-        """
-        project_info = get_project_info(self.working_directory)
-        
-        enhanced_prompt = f"""
-You are a Backend Engineer agent working in the directory: {self.working_directory}
+SUPPORTED_FRAMEWORKS: Tuple[str, ...] = ("FastAPI",)
+SUPPORTED_DATABASES: Tuple[str, ...] = ("PostgreSQL", "SQLite")
+
+# Dependency manifests that mark a backend project as installable
+_REQUIREMENT_FILES = frozenset({'requirements.txt', 'package.json', 'Pipfile', 'poetry.lock'})
+
+logger = logging.getLogger(__name__)
+
+# Dev server startup polling: how long a candidate command must stay up to be
+# accepted, and how often liveness/readiness are checked (seconds)
+_STARTUP_GRACE_PERIOD = 3.0
+_POLL_INTERVAL = 0.1
+
+_PROMPT_PREFIX_TEMPLATE = """
+You are a Backend Engineer agent working in the directory: {working_directory}
 
 IMPORTANT CONTEXT:
 - You are specifically designed for backend development tasks
 - You can create complete backend systems from scratch
-- Supported frameworks: {', '.join(self.supported_frameworks)}
-- Supported databases: {', '.join(self.supported_databases)}
+- Supported frameworks: {frameworks}
+- Supported databases: {databases}
 - Current directory info: {project_info}
 
 BACKEND DEVELOPMENT GUIDELINES:
@@ -64,7 +55,9 @@ BACKEND DEVELOPMENT GUIDELINES:
 15. Use environment variables for sensitive data
 
 TASK TO COMPLETE:
-{task_description}
+"""
+
+_PROMPT_SUFFIX = """
 
 Please create all necessary files and folders for a complete, production-ready backend system.
 Make sure to include:
@@ -84,52 +77,96 @@ Make sure to include:
 
 Focus on creating secure, scalable code that follows modern backend development practices.
 """
-        return enhanced_prompt
+
+
+class BackendEngineer(BaseAgent):
+    """
+    Specialized agent for backend development tasks
+    Can create APIs, microservices, databases, and full backend systems
+    """
+    
+    supported_frameworks = SUPPORTED_FRAMEWORKS
+    supported_databases = SUPPORTED_DATABASES
+    _FRAMEWORKS_JOINED = ", ".join(SUPPORTED_FRAMEWORKS)
+    _DATABASES_JOINED = ", ".join(SUPPORTED_DATABASES)
+    
+    def __init__(self, backend_directory: str = "project/backend", max_turns: int = 100):
+        """
+        Initialize the Backend Engineer agent
+        
+        Args:
+            backend_directory: Directory where backend projects will be created
+            max_turns: Maximum number of turns for Claude Code SDK interactions
+        """
+        super().__init__(backend_directory, max_turns)
+        self.agent_name = "Backend Engineer"
+        self._prompt_prefix: Optional[str] = None
+        self._prompt_prefix_key: Optional[Dict[str, Any]] = None
+    
+    def get_agent_type(self) -> str:
+        """Return the type/name of this agent"""
+        return "Backend Engineer"
+    
+    def _enhance_prompt(self, task_description: str) -> str:
+        """
+        Enhance the task description with backend-specific context
+        """
+        project_info = self._project_info()
+        
+        # Only re-render the static guidance when the project info changed
+        if self._prompt_prefix is None or self._prompt_prefix_key != project_info:
+            self._prompt_prefix = _PROMPT_PREFIX_TEMPLATE.format(
+                working_directory=self.working_directory,
+                frameworks=self._FRAMEWORKS_JOINED,
+                databases=self._DATABASES_JOINED,
+                project_info=project_info
+            )
+            self._prompt_prefix_key = project_info
+        
+        return self._prompt_prefix + task_description + _PROMPT_SUFFIX
     
     def test_implementation(self) -> Dict[str, Any]:
         """
         Test the backend implementation by running dependency installation and starting server as background process
         
+        Synchronous wrapper around test_implementation_async.
+        
         Returns:
             Dictionary containing test results
         """
-        import subprocess
-        import time
-        import requests
-        import os
-        from pathlib import Path
+        return self.run_async(self.test_implementation_async())
+    
+    async def test_implementation_async(self) -> Dict[str, Any]:
+        """
+        Test the backend implementation without blocking the event loop
+        
+        Dependency installation runs through asyncio subprocesses and the readiness
+        probes for / and /health run concurrently, so several agents can test their
+        implementations on one loop.
         
+        Returns:
+            Dictionary containing test results
+        """
         try:
-            # Change to working directory
-            original_cwd = os.getcwd()
-            os.chdir(self.working_directory)
-            
-            # Check for dependency files
-            requirements_txt = Path(self.working_directory) / "requirements.txt"
-            package_json = Path(self.working_directory) / "package.json"
-            pyproject_toml = Path(self.working_directory) / "pyproject.toml"
+            # Check for dependency files with a single directory read
+            with os.scandir(self.working_directory) as entries:
+                top_level_files = frozenset(entry.name for entry in entries if entry.is_file())
             
-            if requirements_txt.exists():
-                print(f"🐍 Installing Python dependencies in {self.working_directory}...")
+            if 'requirements.txt' in top_level_files:
+                logger.info("🐍 Installing Python dependencies in %s...", self.working_directory)
                 
                 # Install Python dependencies
-                install_process = subprocess.run(
-                    ['pip', 'install', '-r', 'requirements.txt'],
-                    cwd=self.working_directory,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
-                )
+                returncode, output = await self._run_install(['pip', 'install', '-r', 'requirements.txt'])
                 
-                if install_process.returncode != 0:
+                if returncode != 0:
                     return {
                         'success': False,
-                        'error': f'pip install failed: {install_process.stderr}',
+                        'error': f'pip install failed: {output}',
                         'working_directory': self.working_directory
                     }
                 
-                print("✅ Python dependencies installed successfully")
-                print(f"🚀 Starting backend server in background on port 8000...")
+                logger.info("✅ Python dependencies installed successfully")
+                logger.info("🚀 Starting backend server in background on port 8000...")
                 
                 # Try different common Python server commands
                 server_commands = [
@@ -141,32 +178,33 @@ Focus on creating secure, scalable code that follows modern backend development
                     ['python', '-m', 'uvicorn', 'app.main:app', '--reload', '--host', '0.0.0.0', '--port', '8000']
                 ]
                 
-            elif package_json.exists():
-                print(f"📦 Installing Node.js dependencies in {self.working_directory}...")
+            elif 'package.json' in top_level_files:
+                if NPM_EXECUTABLE is None:
+                    return {
+                        'success': False,
+                        'error': 'npm not found on PATH; install Node.js to test this backend',
+                        'working_directory': self.working_directory
+                    }
+                
+                logger.info("📦 Installing Node.js dependencies in %s...", self.working_directory)
                 
                 # Install Node.js dependencies
-                install_process = subprocess.run(
-                    ['npm', 'install'],
-                    cwd=self.working_directory,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
-                )
+                returncode, output = await self._run_npm_install()
                 
-                if install_process.returncode != 0:
+                if returncode != 0:
                     return {
                         'success': False,
-                        'error': f'npm install failed: {install_process.stderr}',
+                        'error': f'npm install failed: {output}',
                         'working_directory': self.working_directory
                     }
                 
-                print("✅ Node.js dependencies installed successfully")
-                print(f"🚀 Starting backend server in background on port 8000...")
+                logger.info("✅ Node.js dependencies installed successfully")
+                logger.info("🚀 Starting backend server in background on port 8000...")
                 
                 # Try different Node.js server commands
                 server_commands = [
-                    ['npm', 'start'],
-                    ['npm', 'run', 'dev'],
+                    [NPM_EXECUTABLE, 'start'],
+                    [NPM_EXECUTABLE, 'run', 'dev'],
                     ['node', 'server.js'],
                     ['node', 'app.js'],
                     ['node', 'index.js']
@@ -179,76 +217,101 @@ Focus on creating secure, scalable code that follows modern backend development
                     'working_directory': self.working_directory
                 }
             
-            # Try to start server with different commands
-            dev_process = None
-            for cmd in server_commands:
-                try:
-                    print(f"Trying command: {' '.join(cmd)}")
-                    dev_process = subprocess.Popen(
-                        cmd,
-                        cwd=self.working_directory,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                        preexec_fn=os.setsid if hasattr(os, 'setsid') else None
-                    )
-                    
-                    # Wait a moment to see if process starts successfully
-                    time.sleep(3)
-                    if dev_process.poll() is None:  # Process is still running
-                        print(f"✅ Server started with command: {' '.join(cmd)}")
-                        break
-                    else:
-                        print(f"❌ Command failed: {' '.join(cmd)}")
-                        dev_process = None
-                except FileNotFoundError:
-                    print(f"❌ Command not found: {cmd[0]}")
-                    continue
-                except Exception as e:
-                    print(f"❌ Error with command {' '.join(cmd)}: {str(e)}")
-                    continue
-            
-            if dev_process is None:
-                return {
-                    'success': False,
-                    'error': 'Could not start backend server with any of the attempted commands',
-                    'working_directory': self.working_directory
-                }
+            # Dependency installation changed the tree, so drop the cached snapshot
+            self._invalidate_file_cache()
             
-            # Wait for server to start (poll for up to 30 seconds)
+            server_port = 8000
             server_ready = False
             max_wait_time = 30
-            start_time = time.time()
-            server_port = 8000
             
-            while time.time() - start_time < max_wait_time:
-                try:
-                    response = requests.get(f'http://localhost:{server_port}', timeout=2)
-                    if response.status_code in [200, 404]:  # 404 is OK for API servers
-                        server_ready = True
-                        break
-                except requests.exceptions.RequestException:
-                    pass
-                
-                # Also try health endpoint
+            # One keep-alive session for every probe instead of a new connection per
+            # request; two pooled connections cover the concurrent / and /health probes
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            
+            def probe(path: str, ok_statuses: Tuple[int, ...]) -> bool:
                 try:
-                    response = requests.get(f'http://localhost:{server_port}/health', timeout=2)
-                    if response.status_code == 200:
-                        server_ready = True
-                        break
+                    response = session.get(f'http://localhost:{server_port}{path}', timeout=2)
+                    return response.status_code in ok_statuses
                 except requests.exceptions.RequestException:
-                    pass
-                    
-                time.sleep(2)
+                    return False
             
-            # Store process info for later cleanup (optional)
-            if hasattr(self, '_background_processes'):
-                self._background_processes.append(dev_process)
-            else:
-                self._background_processes = [dev_process]
+            async def server_responding() -> bool:
+                # Probe the root (404 is OK for API servers) and the health endpoint together
+                results = await asyncio.gather(
+                    asyncio.to_thread(probe, '', (200, 404)),
+                    asyncio.to_thread(probe, '/health', (200,))
+                )
+                return any(results)
+            
+            # Server output goes to a log file rather than a pipe: nobody reads the
+            # pipe while we poll, and a full pipe buffer would stall the server.
+            # The server is started with Popen rather than an asyncio subprocess
+            # because it has to outlive the event loop that runs this coroutine.
+            dev_process = None
+            server_log_path = None
+            try:
+                for cmd in server_commands:
+                    log_file = tempfile.NamedTemporaryFile(
+                        mode='w', prefix='backend-server-', suffix='.log', delete=False
+                    )
+                    try:
+                        logger.info("Trying command: %s", ' '.join(cmd))
+                        with log_file:
+                            dev_process = subprocess.Popen(
+                                cmd,
+                                cwd=self.working_directory,
+                                stdout=log_file,
+                                stderr=subprocess.STDOUT,
+                                preexec_fn=os.setsid if hasattr(os, 'setsid') else None
+                            )
+                        
+                        # Poll liveness and readiness together at a short interval, so a
+                        # command that exits is dropped at once and a server that answers
+                        # is accepted without waiting out the startup grace period
+                        deadline = time.monotonic() + _STARTUP_GRACE_PERIOD
+                        while time.monotonic() < deadline and dev_process.poll() is None:
+                            if await server_responding():
+                                server_ready = True
+                                break
+                            await asyncio.sleep(_POLL_INTERVAL)
+                        
+                        if dev_process.poll() is None:  # Process is still running
+                            logger.info("✅ Server started with command: %s", ' '.join(cmd))
+                            server_log_path = log_file.name
+                            break
+                        else:
+                            logger.warning("❌ Command failed: %s", ' '.join(cmd))
+                            dev_process = None
+                    except FileNotFoundError:
+                        logger.warning("❌ Command not found: %s", cmd[0])
+                    except Exception as e:
+                        logger.warning("❌ Error with command %s: %s", ' '.join(cmd), e)
+                        # The server may already be running; don't leave it behind
+                        if dev_process is not None:
+                            await asyncio.to_thread(_terminate_process_group, dev_process)
+                            dev_process = None
+                    
+                    # Discard the log of a failed attempt
+                    os.remove(log_file.name)
+                
+                if dev_process is None:
+                    return {
+                        'success': False,
+                        'error': 'Could not start backend server with any of the attempted commands',
+                        'working_directory': self.working_directory
+                    }
+                
+                # Keep polling until the server answers (up to 30 seconds overall)
+                deadline = time.monotonic() + max_wait_time - _STARTUP_GRACE_PERIOD
+                while not server_ready and time.monotonic() < deadline and dev_process.poll() is None:
+                    await asyncio.sleep(_POLL_INTERVAL)
+                    server_ready = await server_responding()
+            finally:
+                session.close()
             
-            # Change back to original directory
-            os.chdir(original_cwd)
+            # Track the server so close() can stop it
+            self._background_processes.register(dev_process, server_log_path)
             
             if server_ready:
                 return {
@@ -256,6 +319,7 @@ Focus on creating secure, scalable code that follows modern backend development
                     'message': f'Backend server started successfully on port {server_port}',
                     'server_url': f'http://localhost:{server_port}',
                     'process_id': dev_process.pid,
+                    'log_file': server_log_path,
                     'working_directory': self.working_directory,
                     'files_created': self._get_created_files()
                 }
@@ -265,21 +329,19 @@ Focus on creating secure, scalable code that follows modern backend development
                     'success': True,
                     'message': 'Backend server started but may still be initializing',
                     'process_id': dev_process.pid,
+                    'log_file': server_log_path,
                     'working_directory': self.working_directory,
                     'files_created': self._get_created_files(),
                     'note': 'Server may take additional time to fully start up'
                 }
                 
-        except subprocess.TimeoutExpired:
-            os.chdir(original_cwd)
+        except asyncio.TimeoutError:
             return {
                 'success': False,
                 'error': 'Dependency installation timed out after 5 minutes',
                 'working_directory': self.working_directory
             }
         except Exception as e:
-            if 'original_cwd' in locals():
-                os.chdir(original_cwd)
             return {
                 'success': False,
                 'error': f'Test implementation failed: {str(e)}',
@@ -289,16 +351,16 @@ Focus on creating secure, scalable code that follows modern backend development
     def get_specialized_status(self) -> Dict[str, Any]:
         """Get backend-specific status information"""
         base_status = self.get_status()
-        project_info = get_project_info(self.working_directory)
+        project_info = self._project_info()
+        index = self._file_index()
         
         base_status.update({
             'supported_frameworks': self.supported_frameworks,
             'supported_databases': self.supported_databases,
             'project_info': project_info,
-            'has_requirements': any(f in ['requirements.txt', 'package.json', 'Pipfile', 'poetry.lock'] 
-                                  for f in self._get_created_files()),
-            'has_dockerfile': 'Dockerfile' in self._get_created_files(),
-            'has_tests': any('test' in f.lower() for f in self._get_created_files())
+            'has_requirements': not _REQUIREMENT_FILES.isdisjoint(index.names),
+            'has_dockerfile': 'Dockerfile' in index.names,
+            'has_tests': index.has_tests
         })
         
         return base_status
\ No newline at end of file
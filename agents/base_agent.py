@@ -4,18 +4,161 @@ Base Agent class for Claude Code SDK powered agents
 
 import os
 import asyncio
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+import atexit
+import contextlib
+import itertools
+import logging
+import threading
+import shutil
+import signal
+import subprocess
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import List, Dict, Any, Iterator, Optional, FrozenSet, Protocol, Set, Tuple
 import uuid
 from dotenv import load_dotenv
 import anyio
 from claude_code_sdk import query, ClaudeCodeOptions
+from .agent_pool import MAX_PARALLEL_AGENTS, run_parallel
+from .utils import format_file_list, get_project_info
 
 load_dotenv()
 
+# Dependency, virtualenv and VCS trees are never part of an agent's output
+_SKIP_DIRS = frozenset({'node_modules', '.venv', '.git'})
 
-class BaseAgent(ABC):
-    """Base class for all Claude Code SDK powered agents"""
+# Shared agent instances handed out by BaseAgent.get, keyed by (class, directory, max_turns)
+_AGENT_CACHE: Dict[Tuple[type, str, Optional[int]], 'BaseAgent'] = {}
+_AGENT_CACHE_LOCK = threading.Lock()
+
+# Only the most recent tasks are kept in memory; each entry holds the full SDK transcript
+_HISTORY_LIMIT = 32
+
+# Lines of install output kept for error reporting; the rest is only logged
+_INSTALL_TAIL_LINES = 200
+
+# npm resolved once against PATH at import; None when Node.js isn't installed
+NPM_EXECUTABLE: Optional[str] = shutil.which('npm')
+
+# Skip registry round-trips the smoke tests don't need (audit, funding, refetching cached metadata)
+_NPM_INSTALL_FLAGS = ('--prefer-offline', '--no-audit', '--no-fund', '--loglevel=error')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class _FileIndex:
+    """Snapshot of the files in an agent's working directory"""
+    files: List[str]
+    names: FrozenSet[str]
+    lower: Tuple[str, ...]
+    has_tests: bool
+    formatted: str
+
+    @classmethod
+    def from_files(cls, files: List[str]) -> '_FileIndex':
+        """Build the index from a list of relative file paths"""
+        lower = tuple(f.lower() for f in files)
+        return cls(
+            files=files,
+            names=frozenset(files),
+            lower=lower,
+            has_tests=any('test' in f for f in lower),
+            formatted=format_file_list(files) if files else "No existing files"
+        )
+
+
+def _terminate_process_group(process: subprocess.Popen, timeout: float = 5) -> None:
+    """Stop a process started in its own session (SIGTERM to its group, then SIGKILL after timeout)"""
+    if process.poll() is not None:
+        return
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+        else:
+            process.terminate()
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    except OSError:
+        pass  # already gone
+
+
+# Registries that currently hold processes. One atexit hook covers all of them,
+# and a registry only stays here while it has something to stop, so short-lived
+# agents that never start a server don't accumulate.
+_ACTIVE_REGISTRIES: Set['_ProcessRegistry'] = set()
+
+
+def _terminate_active_registries() -> None:
+    """Stop every tracked background process when the interpreter exits"""
+    for registry in list(_ACTIVE_REGISTRIES):
+        registry.terminate_all()
+
+
+atexit.register(_terminate_active_registries)
+
+
+class _ProcessRegistry:
+    """
+    Background processes started by an agent, kept as parallel lists
+    
+    Processes are started in their own session (os.setsid), so each one is
+    stopped by signalling its whole process group.
+    """
+    
+    def __init__(self):
+        self.pids: List[int] = []
+        self.procs: List[subprocess.Popen] = []
+        self.start_times: List[float] = []
+        self.log_paths: List[Optional[str]] = []
+    
+    def __len__(self) -> int:
+        return len(self.procs)
+    
+    def register(self, process: subprocess.Popen, log_path: Optional[str] = None) -> None:
+        """Track a process so it is stopped when the agent is closed"""
+        self.pids.append(process.pid)
+        self.procs.append(process)
+        self.start_times.append(time.monotonic())
+        self.log_paths.append(log_path)
+        _ACTIVE_REGISTRIES.add(self)
+    
+    def terminate_all(self, timeout: float = 5) -> None:
+        """Terminate every tracked process (SIGTERM, then SIGKILL after timeout)"""
+        for process in self.procs:
+            _terminate_process_group(process, timeout)
+            for stream in (process.stdout, process.stderr):
+                if stream is not None:
+                    stream.close()
+        
+        self.pids.clear()
+        self.procs.clear()
+        self.start_times.clear()
+        self.log_paths.clear()
+        _ACTIVE_REGISTRIES.discard(self)
+
+
+class AgentProtocol(Protocol):
+    """Structural type for anything that can be driven like an agent"""
+    
+    working_directory: str
+    
+    def get_agent_type(self) -> str: ...
+    
+    def execute_task(self, task_description: str) -> Dict[str, Any]: ...
+    
+    def get_status(self) -> Dict[str, Any]: ...
+
+
+class BaseAgent:
+    """
+    Base class for all Claude Code SDK powered agents
+    
+    Subclasses must implement _enhance_prompt and get_agent_type.
+    """
     
     def __init__(self, working_directory: str, max_turns: int = 5):
         """
@@ -28,7 +171,16 @@ class BaseAgent(ABC):
         self.working_directory = os.path.abspath(working_directory)
         self.max_turns = max_turns
         self.session_id = str(uuid.uuid4())
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=_HISTORY_LIMIT)
+        self._task_seq = itertools.count(1)  # per-agent task ids for history entries
+        self._file_index_cache: Optional[_FileIndex] = None
+        self._pinned_file_index: Optional[_FileIndex] = None  # set inside _files_snapshot()
+        self._files_cache: Optional[Tuple[int, List[str]]] = None  # (top-level mtime_ns, files)
+        self._project_info_cache: Optional[Tuple[int, Dict[str, Any]]] = None  # (top-level mtime_ns, info)
+        self._runner = None  # asyncio.Runner, created on first run_async call
+        # Dev servers must not outlive the interpreter; a registry with processes
+        # is stopped by the module's atexit hook, without keeping the agent alive
+        self._background_processes = _ProcessRegistry()
         
         # Ensure working directory exists
         os.makedirs(self.working_directory, exist_ok=True)
@@ -37,40 +189,81 @@ class BaseAgent(ABC):
         if not os.getenv('ANTHROPIC_API_KEY'):
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
     
+    @classmethod
+    def get(cls, working_directory: str, max_turns: Optional[int] = None):
+        """
+        Get a shared agent for a directory, creating it on first use
+        
+        Repeated calls with the same class, directory and max_turns return the
+        same instance instead of re-running __init__. Cached agents share their
+        conversation history and event loop, so don't drive one from several
+        threads at once.
+        
+        Args:
+            working_directory: Directory where the agent will create/modify files
+            max_turns: Maximum number of turns, or None for the agent's default
+            
+        Returns:
+            The cached agent instance
+        """
+        key = (cls, os.path.abspath(working_directory), max_turns)
+        with _AGENT_CACHE_LOCK:
+            agent = _AGENT_CACHE.get(key)
+            if agent is None:
+                agent = cls(working_directory) if max_turns is None else cls(working_directory, max_turns)
+                _AGENT_CACHE[key] = agent
+        return agent
+    
     def run_async(self, coro):
-        """Helper function to run async code"""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        return loop.run_until_complete(coro)
+        """
+        Helper function to run async code from synchronous callers
+        
+        On Python 3.11+ every call reuses one asyncio.Runner (and so one event
+        loop) for the lifetime of the agent. Older versions fall back to
+        asyncio.run. Either way, calling this from inside a running event loop
+        raises RuntimeError instead of silently starting a second loop.
+        """
+        if not hasattr(asyncio, 'Runner'):
+            return asyncio.run(coro)
+        if self._runner is None:
+            self._runner = asyncio.Runner()
+        return self._runner.run(coro)
+    
+    def close(self):
+        """Stop background processes and close the agent's event loop, if one was created"""
+        self._background_processes.terminate_all()
+        if self._runner is not None:
+            self._runner.close()
+            self._runner = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     async def query_claude_code_sdk(self, prompt: str, options: Optional[ClaudeCodeOptions] = None) -> List[Any]:
-        """Query Claude Code SDK with error handling"""
+        """
+        Query Claude Code SDK with error handling
+        
+        The working directory is handed to the SDK through options.cwd rather
+        than os.chdir, so several agents can query concurrently in one process.
+        """
         if options is None:
             options = ClaudeCodeOptions(
                 max_turns=self.max_turns,
                 allowed_tools=["read", "write", "edit", "grep", "Bash", "glob", "Bash(npm install)", "Bash(npm run dev)", "Bash(npm run build)", "Bash(python -m venv .venv)", "Bash(source .venv/bin/activate)"],
-                permission_mode="bypassPermissions"
+                permission_mode="bypassPermissions",
+                cwd=self.working_directory
             )
+        elif options.cwd is None:
+            options = replace(options, cwd=self.working_directory)
         
         messages = []
         try:
-            # Change to working directory before querying
-            original_cwd = os.getcwd()
-            os.chdir(self.working_directory)
-            
             async for message in query(prompt=prompt, options=options):
                 messages.append(message)
-                
-            # Change back to original directory
-            os.chdir(original_cwd)
-            
         except Exception as e:
-            # Change back to original directory even on error
-            if 'original_cwd' in locals():
-                os.chdir(original_cwd)
             raise Exception(f"Claude Code SDK error: {str(e)}")
         
         return messages
@@ -79,6 +272,20 @@ class BaseAgent(ABC):
         """
         Execute a task using Claude Code SDK
         
+        Args:
+            task_description: Description of the task to execute
+            
+        Returns:
+            Dictionary containing task results and metadata
+        """
+        return self.run_async(self.execute_task_async(task_description))
+    
+    async def execute_task_async(self, task_description: str) -> Dict[str, Any]:
+        """
+        Execute a task using Claude Code SDK from within a running event loop
+        
+        Lets callers run several agents concurrently, e.g. with asyncio.gather.
+        
         Args:
             task_description: Description of the task to execute
             
@@ -90,16 +297,19 @@ class BaseAgent(ABC):
             enhanced_prompt = self._enhance_prompt(task_description)
             
             # Query Claude Code SDK
-            messages = self.run_async(self.query_claude_code_sdk(enhanced_prompt))
-
-            print(messages)
+            messages = await self.query_claude_code_sdk(enhanced_prompt)
+            
+            # The SDK may have written files, so drop the cached snapshot
+            self._invalidate_file_cache()
+            logger.debug("%s SDK messages: %r", self.get_agent_type(), messages)
             
             # Store conversation history
             self.conversation_history.append({
+                'task_id': next(self._task_seq),
                 'task': task_description,
                 'enhanced_prompt': enhanced_prompt,
                 'messages': messages,
-                'timestamp': uuid.uuid4().hex
+                'timestamp': time.time_ns()
             })
             
             return {
@@ -118,17 +328,182 @@ class BaseAgent(ABC):
                 'working_directory': self.working_directory
             }
     
+    async def run_all(self, task_descriptions: List[str], max_parallel: int = MAX_PARALLEL_AGENTS) -> List[Dict[str, Any]]:
+        """
+        Execute several independent tasks concurrently
+        
+        The tasks share this agent's working directory, so only batch tasks that
+        touch different files.
+        
+        Args:
+            task_descriptions: Descriptions of the tasks to execute
+            max_parallel: Maximum number of SDK sessions running at the same time
+            
+        Returns:
+            One result dictionary per task, in order
+        """
+        return await run_parallel(
+            (self.execute_task_async(task) for task in task_descriptions),
+            max_parallel=max_parallel
+        )
+    
+    async def _run_install(self, cmd: List[str], timeout: float = 300) -> Tuple[int, str]:
+        """
+        Run a dependency installation command in the working directory
+        
+        Output is streamed line by line to the debug log instead of being
+        buffered whole, and only the last few hundred lines are retained.
+        
+        Args:
+            cmd: Command and arguments to execute
+            timeout: Seconds to wait before killing the install (5 minutes by default)
+            
+        Returns:
+            Tuple of (return code, tail of the combined stdout/stderr output)
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=self.working_directory,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        tail = deque(maxlen=_INSTALL_TAIL_LINES)
+        
+        async def drain() -> int:
+            async for raw_line in process.stdout:
+                line = raw_line.decode(errors='replace').rstrip()
+                logger.debug("[%s] %s", cmd[0], line)
+                tail.append(line)
+            return await process.wait()
+        
+        try:
+            returncode = await asyncio.wait_for(drain(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return returncode, '\n'.join(tail)
+    
+    def _npm_install_command(self) -> List[str]:
+        """
+        Build the npm command that installs the working directory's dependencies
+        
+        Uses `npm ci` when a package-lock.json is present, since it skips
+        dependency resolution, and `npm install` otherwise.
+        """
+        has_lockfile = os.path.isfile(os.path.join(self.working_directory, 'package-lock.json'))
+        return [NPM_EXECUTABLE or 'npm', 'ci' if has_lockfile else 'install', *_NPM_INSTALL_FLAGS]
+    
+    async def _run_npm_install(self) -> Tuple[int, str]:
+        """
+        Install the working directory's npm dependencies
+        
+        The agents edit package.json without regenerating package-lock.json, and
+        `npm ci` refuses an out-of-sync lockfile, so a failed `npm ci` is retried
+        once with `npm install` and the same flags.
+        
+        Returns:
+            Tuple of (return code, last lines of the combined output)
+        """
+        cmd = self._npm_install_command()
+        returncode, output = await self._run_install(cmd)
+        if returncode != 0 and cmd[1] == 'ci':
+            logger.info("npm ci failed in %s, retrying with npm install", self.working_directory)
+            returncode, output = await self._run_install([cmd[0], 'install', *cmd[2:]])
+        return returncode, output
+    
     def _get_created_files(self) -> List[str]:
-        """Get list of files in the working directory"""
-        files = []
-        for root, dirs, filenames in os.walk(self.working_directory):
-            for filename in filenames:
-                file_path = os.path.join(root, filename)
-                relative_path = os.path.relpath(file_path, self.working_directory)
-                files.append(relative_path)
-        return files
-    
-    @abstractmethod
+        """
+        Get list of files in the working directory
+        
+        The listing is cached against the working directory's mtime, so repeated
+        status calls don't re-walk the tree. Changes below the top level don't
+        touch that mtime, which is why anything that writes files must call
+        _invalidate_file_cache().
+        """
+        try:
+            mtime_ns = os.stat(self.working_directory).st_mtime_ns
+        except OSError:
+            return []
+        
+        if self._files_cache is None or self._files_cache[0] != mtime_ns:
+            self._files_cache = (mtime_ns, list(self._iter_created_files()))
+        return list(self._files_cache[1])
+    
+    def _iter_created_files(self, directory: Optional[str] = None, prefix: str = '') -> Iterator[str]:
+        """
+        Lazily yield relative file paths in the working directory using os.scandir
+        
+        Unlike _get_created_files this is uncached, but a membership test or any()
+        over it stops walking as soon as a match is found.
+        """
+        try:
+            with os.scandir(directory or self.working_directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            yield from self._iter_created_files(entry.path, prefix + entry.name + os.sep)
+                    elif entry.is_file():
+                        yield prefix + entry.name
+        except OSError:
+            return
+    
+    def _project_info(self) -> Dict[str, Any]:
+        """
+        Get project information for the working directory
+        
+        Cached the same way as _get_created_files: reused while the top-level
+        mtime is unchanged and dropped by _invalidate_file_cache().
+        """
+        try:
+            mtime_ns = os.stat(self.working_directory).st_mtime_ns
+        except OSError:
+            return get_project_info(self.working_directory)
+        
+        if self._project_info_cache is None or self._project_info_cache[0] != mtime_ns:
+            self._project_info_cache = (mtime_ns, get_project_info(self.working_directory))
+        return dict(self._project_info_cache[1])
+    
+    def _invalidate_file_cache(self) -> None:
+        """Forget cached directory listings after files may have changed"""
+        self._files_cache = None
+        self._file_index_cache = None
+        self._project_info_cache = None
+    
+    def _file_index(self) -> _FileIndex:
+        """
+        Get a snapshot of the working directory files
+        
+        The snapshot is reused until the agent executes another task, so
+        several prompts built back to back only walk the directory once.
+        """
+        if self._pinned_file_index is not None:
+            return self._pinned_file_index
+        if self._file_index_cache is None:
+            self._file_index_cache = _FileIndex.from_files(self._get_created_files())
+        return self._file_index_cache
+    
+    @contextlib.contextmanager
+    def _files_snapshot(self) -> Iterator[_FileIndex]:
+        """
+        Pin one file snapshot for a batch of prompts
+        
+        Inside the block every prompt sees the same listing, even after a task
+        writes files, so a sequence like add_feature / optimize_performance /
+        add_testing walks and formats the directory once instead of per task.
+        
+        Example:
+            with agent._files_snapshot():
+                agent.add_feature(...)
+                agent.add_testing()
+        """
+        previous = self._pinned_file_index
+        self._pinned_file_index = self._file_index()
+        try:
+            yield self._pinned_file_index
+        finally:
+            self._pinned_file_index = previous
+    
     def _enhance_prompt(self, task_description: str) -> str:
         """
         Enhance the task description with agent-specific context
@@ -139,12 +514,11 @@ class BaseAgent(ABC):
         Returns:
             Enhanced prompt with agent-specific context
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement _enhance_prompt")
     
-    @abstractmethod
     def get_agent_type(self) -> str:
         """Return the type/name of this agent"""
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement get_agent_type")
     
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the agent"""
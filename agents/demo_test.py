@@ -8,215 +8,313 @@ by running different tasks and showing the results.
 
 import os
 import sys
-import json
+import argparse
+import asyncio
+import heapq
+import logging
+import queue
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List, Optional
 
 # Add the parent directory to sys.path so we can import the agents
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from agents import FrontendEngineer, BackendEngineer, EngineeringManager, TestingEngineer
+# Directories the demos generate into
+PROJECT_DIR = os.path.join(parent_dir, 'project')
+FRONTEND_DIR = os.path.join(PROJECT_DIR, 'frontend')
+BACKEND_DIR = os.path.join(PROJECT_DIR, 'backend')
+COMPONENTS_DIR = os.path.join(FRONTEND_DIR, 'component-library')
+DASHBOARD_DIR = os.path.join(FRONTEND_DIR, 'admin-dashboard')
+MICROSERVICE_DIR = os.path.join(BACKEND_DIR, 'user-microservice')
+
+# The agents package loads each agent class (and the SDK) on first use, so
+# referencing them through the package keeps a cancelled demo from paying for it
+import agents
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)  # demo output is logged at INFO whatever the root level is
+
+# Queue behind the console listener, set by start_console_logging
+_console_queue: Optional[queue.Queue] = None
+
+_SEP = "=" * 60
+
+
+@dataclass(slots=True)
+class AgentRun:
+    """Creation and test results of one engineering agent"""
+    name: str
+    agent: Any
+    create_result: Dict[str, Any]
+    test_result: Dict[str, Any]
+    
+    @property
+    def passed(self) -> bool:
+        return self.test_result.get('success', False)
+
+
+@dataclass(slots=True)
+class ProjectRun:
+    """Results of a managed full-stack run: the manager's steps plus one AgentRun per team"""
+    manager: Any
+    coordination_result: Dict[str, Any]
+    validation_result: Dict[str, Any]
+    runs: List[AgentRun]
+    
+    @property
+    def passed(self) -> bool:
+        return (self.coordination_result.get('success', False)
+                and self.validation_result.get('success', False)
+                and all(run.passed for run in self.runs))
+
+
+def start_console_logging() -> QueueListener:
+    """
+    Route log records through a queue to a stdout handler on a background thread
+    
+    Callers only enqueue records, so a slow terminal doesn't hold up the next
+    agent launch. Stop the returned listener to flush pending output.
+    """
+    global _console_queue
+    _console_queue = queue.Queue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    # The QueueHandler formats records before enqueueing them, so it needs the bare format too
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[QueueHandler(_console_queue)])
+    listener = QueueListener(_console_queue, console)
+    listener.start()
+    return listener
+
+
+def _emit(text: str):
+    """Write one piece of demo output, keeping everything on stdout in order"""
+    # Once logging is configured all output goes through it, so prints can't overtake
+    # queued records; without it (e.g. demos called after import) print directly
+    if logger.hasHandlers():
+        logger.info(text)
+    else:
+        print(text)
+
+
+def _ask(prompt: str) -> str:
+    """Prompt for input after the queued output before it has been written"""
+    if _console_queue is not None:
+        _console_queue.join()
+    return input(prompt)
 
 
 def print_separator(title: str = ""):
     """Print a visual separator with optional title"""
     if title:
-        print(f"\n{'='*60}")
-        print(f" {title}")
-        print(f"{'='*60}")
+        _emit(f"\n{_SEP}\n {title}\n{_SEP}")
     else:
-        print(f"{'='*60}")
+        _emit(_SEP)
 
 
 def print_result(result: Dict[str, Any], task_name: str):
     """Print the result of a task execution"""
-    print(f"\n🔍 Task: {task_name}")
-    print(f"✅ Success: {result.get('success', False)}")
+    # Collect the report and write it in one go rather than one print per line
+    lines = [
+        f"\n🔍 Task: {task_name}",
+        f"✅ Success: {result.get('success', False)}",
+    ]
     
     if result.get('success'):
-        print(f"📁 Working Directory: {result.get('working_directory', 'N/A')}")
-        print(f"🆔 Session ID: {result.get('session_id', 'N/A')}")
+        lines.append(f"📁 Working Directory: {result.get('working_directory', 'N/A')}")
+        lines.append(f"🆔 Session ID: {result.get('session_id', 'N/A')}")
         
         files = result.get('files_created', [])
         if files:
-            print(f"📄 Files Created ({len(files)}):")
-            for file in sorted(files)[:10]:  # Show first 10 files
-                print(f"   - {file}")
+            lines.append(f"📄 Files Created ({len(files)}):")
+            lines.extend(f"   - {file}" for file in heapq.nsmallest(10, files))  # Show first 10 files
             if len(files) > 10:
-                print(f"   ... and {len(files) - 10} more files")
+                lines.append(f"   ... and {len(files) - 10} more files")
         else:
-            print("📄 No files were created")
+            lines.append("📄 No files were created")
             
         # Show first few messages from Claude Code SDK
         messages = result.get('messages', [])
         if messages:
-            print(f"💬 SDK Messages: {len(messages)} total")
+            lines.append(f"💬 SDK Messages: {len(messages)} total")
             # Note: In practice, you might want to parse and display these messages
             # For demo purposes, we'll just show the count
     else:
-        print(f"❌ Error: {result.get('error', 'Unknown error')}")
+        lines.append(f"❌ Error: {result.get('error', 'Unknown error')}")
+    
+    _emit("\n".join(lines))
 
 
-def demo_managed_fullstack_todo_app():
+def _as_result(outcome: Any) -> Dict[str, Any]:
+    """Turn an exception returned by asyncio.gather into a failed result"""
+    if isinstance(outcome, BaseException):
+        return {'success': False, 'error': str(outcome)}
+    return outcome
+
+
+async def demo_managed_fullstack_todo_app():
     """Demo: Engineering Manager Coordinated Full-Stack Todo App"""
     print_separator("Engineering Manager Coordinated Full-Stack Demo")
-    print("Creating a coordinated todo application using Engineering Manager → Frontend → Backend workflow...")
+    _emit("Creating a coordinated todo application using Engineering Manager → Frontend → Backend workflow...")
     
     # Step 1: Engineering Manager Coordinates the Project
     print_separator("Step 1: Engineering Manager Coordination")
-    project_dir = os.path.join(os.path.dirname(current_dir), 'project')
-    manager = EngineeringManager(project_dir)
+    project_dir = PROJECT_DIR
+    manager = agents.EngineeringManager.get(project_dir)
     
-    print(f"👔 Manager Agent: {manager.get_agent_type()}")
-    print(f"📂 Project Directory: {manager.working_directory}")
+    _emit(f"👔 Manager Agent: {manager.get_agent_type()}")
+    _emit(f"📂 Project Directory: {manager.working_directory}")
     
-    print(f"\n📋 Coordinating project from specification...")
-    coordination_result = manager.coordinate_project()
+    _emit(f"\n📋 Coordinating project from specification...")
+    coordination_result = await manager.coordinate_project_async()
     print_result(coordination_result, "Project Coordination")
     
-    # Step 2: Create Frontend Following Manager's Instructions
-    print_separator("Step 2: Frontend Implementation (Following Manager Instructions)")
-    frontend_dir = os.path.join(os.path.dirname(current_dir), 'project', 'frontend')
-    frontend_agent = FrontendEngineer(frontend_dir)
+    # Steps 2 & 3: Create Frontend and Backend Following Manager's Instructions
+    # The two directories are disjoint, so both agents work at the same time
+    print_separator("Steps 2 & 3: Frontend and Backend Implementation (Following Manager Instructions)")
+    frontend_dir = FRONTEND_DIR
+    frontend_agent = agents.FrontendEngineer.get(frontend_dir)
+    backend_dir = BACKEND_DIR
+    backend_agent = agents.BackendEngineer.get(backend_dir)
     
-    print(f"🤖 Frontend Agent: {frontend_agent.get_agent_type()}")
-    print(f"📂 Frontend Directory: {frontend_agent.working_directory}")
+    _emit(f"🤖 Frontend Agent: {frontend_agent.get_agent_type()}")
+    _emit(f"📂 Frontend Directory: {frontend_agent.working_directory}")
+    _emit(f"🤖 Backend Agent: {backend_agent.get_agent_type()}")
+    _emit(f"📂 Backend Directory: {backend_agent.working_directory}")
     
     frontend_task = "Follow the detailed instructions in the CLAUDE.md file in this directory to create the frontend application. Read the CLAUDE.md file first and implement exactly what is specified, including API endpoints, data models, and configuration."
-    
-    print(f"\n🚀 Creating frontend following manager's instructions...")
-    frontend_result = frontend_agent.execute_task(frontend_task)
-    print_result(frontend_result, "Managed Frontend Creation")
-    
-    # Step 3: Create Backend Following Manager's Instructions
-    print_separator("Step 3: Backend Implementation (Following Manager Instructions)")
-    backend_dir = os.path.join(os.path.dirname(current_dir), 'project', 'backend')
-    backend_agent = BackendEngineer(backend_dir)
-    
-    print(f"🤖 Backend Agent: {backend_agent.get_agent_type()}")
-    print(f"📂 Backend Directory: {backend_agent.working_directory}")
-    
     backend_task = "Follow the detailed instructions in the CLAUDE.md file in this directory to create the backend application. Read the CLAUDE.md file first and implement exactly what is specified, including API endpoints, data models, port configuration, and CORS settings."
     
-    print(f"\n🚀 Creating backend following manager's instructions...")
-    backend_result = backend_agent.execute_task(backend_task)
+    _emit(f"\n🚀 Creating frontend and backend following manager's instructions...")
+    frontend_result, backend_result = map(_as_result, await asyncio.gather(
+        frontend_agent.execute_task_async(frontend_task),
+        backend_agent.execute_task_async(backend_task),
+        return_exceptions=True
+    ))
+    print_result(frontend_result, "Managed Frontend Creation")
     print_result(backend_result, "Managed Backend Creation")
     
     # Step 4: Validate Project Alignment
     print_separator("Step 4: Project Alignment Validation")
-    print("🔍 Validating coordination between frontend and backend...")
-    validation_result = manager.validate_project_alignment()
+    _emit("🔍 Validating coordination between frontend and backend...")
+    validation_result = await manager.validate_project_alignment_async()
     print_result(validation_result, "Project Alignment Validation")
     
-    # Step 5: Test Frontend Implementation
-    print_separator("Step 5: Testing Frontend Implementation")
-    print("🧪 Installing dependencies and validating frontend...")
-    frontend_test_result = frontend_agent.test_implementation()
+    # Steps 5 & 6: Test Frontend and Backend Implementations together
+    print_separator("Steps 5 & 6: Testing Frontend and Backend Implementations")
+    _emit("🧪 Installing dependencies and validating frontend and backend...")
+    frontend_test_result, backend_test_result = map(_as_result, await asyncio.gather(
+        frontend_agent.test_implementation_async(),
+        backend_agent.test_implementation_async(),
+        return_exceptions=True
+    ))
     print_result(frontend_test_result, "Frontend Implementation Test")
-    
-    # Step 6: Test Backend Implementation
-    print_separator("Step 6: Testing Backend Implementation")
-    print("🧪 Installing dependencies and validating backend...")
-    backend_test_result = backend_agent.test_implementation()
     print_result(backend_test_result, "Backend Implementation Test")
     
     # Step 7: Test Full Stack Implementation
     print_separator("Step 7: Testing Full Stack Implementation")
-    print("🧪 Installing dependencies and validating full stack...")
-    fullstack_test_result = testing_engineer.test_web_application()
+    _emit("🧪 Installing dependencies and validating full stack...")
+    testing_engineer = agents.TestingEngineer()
+    fullstack_test_result = await asyncio.to_thread(testing_engineer.test_web_application, "http://localhost:3001")
     print_result(fullstack_test_result, "Full Stack Implementation Test")
     
     # Summary
     print_separator("Managed Full-Stack Project Summary")
-    print("✅ Engineering Manager coordinated full-stack application created and tested!")
-    print(f"👔 Manager: {project_dir}")
-    print(f"🎨 Frontend: {frontend_dir}")
-    print(f"⚙️ Backend: {backend_dir}")
+    _emit("✅ Engineering Manager coordinated full-stack application created and tested!")
+    _emit(f"👔 Manager: {project_dir}")
+    _emit(f"🎨 Frontend: {frontend_dir}")
+    _emit(f"⚙️ Backend: {backend_dir}")
+    
+    project = ProjectRun(
+        manager=manager,
+        coordination_result=coordination_result,
+        validation_result=validation_result,
+        runs=[
+            AgentRun("Frontend", frontend_agent, frontend_result, frontend_test_result),
+            AgentRun("Backend", backend_agent, backend_result, backend_test_result),
+        ]
+    )
     
     # Show test results summary
-    coordination_success = coordination_result.get('success', False)
-    validation_success = validation_result.get('success', False)
-    frontend_success = frontend_test_result.get('success', False)
-    backend_success = backend_test_result.get('success', False)
-    
-    print(f"\n📊 Coordination Results:")
-    print(f"   Project Coordination: {'✅ PASSED' if coordination_success else '❌ FAILED'}")
-    print(f"   Alignment Validation: {'✅ PASSED' if validation_success else '❌ FAILED'}")
-    print(f"   Frontend Tests: {'✅ PASSED' if frontend_success else '❌ FAILED'}")
-    print(f"   Backend Tests: {'✅ PASSED' if backend_success else '❌ FAILED'}")
-    
-    if all([coordination_success, validation_success, frontend_success, backend_success]):
-        print("\n🎯 Perfectly Coordinated Application Ready!")
-        print("   1. Manager created aligned specifications")
-        print("   2. Frontend and Backend implemented according to specifications")
-        print("   3. All components tested and validated")
-        print("   4. Ready for production deployment")
+    _emit(f"\n📊 Coordination Results:")
+    _emit(f"   Project Coordination: {'✅ PASSED' if coordination_result.get('success', False) else '❌ FAILED'}")
+    _emit(f"   Alignment Validation: {'✅ PASSED' if validation_result.get('success', False) else '❌ FAILED'}")
+    for run in project.runs:
+        _emit(f"   {run.name} Tests: {'✅ PASSED' if run.passed else '❌ FAILED'}")
+    
+    if project.passed:
+        _emit("\n🎯 Perfectly Coordinated Application Ready!")
+        _emit("   1. Manager created aligned specifications")
+        _emit("   2. Frontend and Backend implemented according to specifications")
+        _emit("   3. All components tested and validated")
+        _emit("   4. Ready for production deployment")
     else:
-        print("\n⚠️  Some coordination or tests failed. Check detailed output above.")
+        _emit("\n⚠️  Some coordination or tests failed. Check detailed output above.")
     
-    return {
-        'manager': {'agent': manager, 'coordination_result': coordination_result, 'validation_result': validation_result},
-        'frontend': {'agent': frontend_agent, 'result': frontend_result, 'test_result': frontend_test_result},
-        'backend': {'agent': backend_agent, 'result': backend_result, 'test_result': backend_test_result}
-    }
+    return project
 
 
 def demo_managed_testing_engineer_app():
     """Demo: Engineering Manager Coordinated Full-Stack Todo App"""
     print_separator("Engineering Manager Coordinated Full-Stack Demo")
-    print("Creating a coordinated todo application using Engineering Manager → Frontend → Backend workflow...")
+    _emit("Creating a coordinated todo application using Engineering Manager → Frontend → Backend workflow...")
     
     # Step 1: Engineering Manager Coordinates the Project
     # print_separator("Step 1: Engineering Manager Coordination")
-    # project_dir = os.path.join(os.path.dirname(current_dir), 'project')
-    # manager = EngineeringManager(project_dir)
+    # project_dir = PROJECT_DIR
+    # manager = agents.EngineeringManager.get(project_dir)
     
-    # print(f"👔 Manager Agent: {manager.get_agent_type()}")
-    # print(f"📂 Project Directory: {manager.working_directory}")
+    # _emit(f"👔 Manager Agent: {manager.get_agent_type()}")
+    # _emit(f"📂 Project Directory: {manager.working_directory}")
     
-    # print(f"\n📋 Coordinating project from specification...")
+    # _emit(f"\n📋 Coordinating project from specification...")
     # coordination_result = manager.coordinate_project()
     # print_result(coordination_result, "Project Coordination")
 
     # Step 2: Frontend Engineer Creates the Frontend
     print_separator("Step 2: Frontend Engineer Frontend Creation")
-    frontend_dir = os.path.join(os.path.dirname(current_dir), 'project', 'frontend')
-    frontend_agent = FrontendEngineer(frontend_dir)
+    frontend_dir = FRONTEND_DIR
+    frontend_agent = agents.FrontendEngineer.get(frontend_dir)
     
-    print(f"🤖 Frontend Agent: {frontend_agent.get_agent_type()}")
-    print(f"📂 Frontend Directory: {frontend_agent.working_directory}")
+    _emit(f"🤖 Frontend Agent: {frontend_agent.get_agent_type()}")
+    _emit(f"📂 Frontend Directory: {frontend_agent.working_directory}")
     
 
     # Step 3: Backend Engineer Creates the Backend
     print_separator("Step 3: Backend Engineer Backend Creation")
-    backend_dir = os.path.join(os.path.dirname(current_dir), 'project', 'backend')
-    backend_agent = BackendEngineer(backend_dir)
+    backend_dir = BACKEND_DIR
+    backend_agent = agents.BackendEngineer.get(backend_dir)
 
 
     # Step 5: Test Frontend Implementation
     print_separator("Step 5: Testing Frontend Implementation")
-    print("🧪 Installing dependencies and validating frontend...")
+    _emit("🧪 Installing dependencies and validating frontend...")
     frontend_test_result = frontend_agent.test_implementation()
     print_result(frontend_test_result, "Frontend Implementation Test")
     
     # Step 6: Test Backend Implementation
     print_separator("Step 6: Testing Backend Implementation")
-    print("🧪 Installing dependencies and validating backend...")
+    _emit("🧪 Installing dependencies and validating backend...")
     backend_test_result = backend_agent.test_implementation()
     print_result(backend_test_result, "Backend Implementation Test")
 
     test_url = "http://localhost:3001"
     
     # Create the testing engineer
-    testing_engineer = TestingEngineer()
+    testing_engineer = agents.TestingEngineer()
     
     # Step 7: Test Full Stack Implementation
     print_separator("Step 7: Testing Full Stack Implementation")
-    print("🧪 Installing dependencies and validating full stack...")
+    _emit("🧪 Installing dependencies and validating full stack...")
     fullstack_test_result = testing_engineer.test_web_application(test_url)
     print_result(fullstack_test_result, "Full Stack Implementation Test")
+    
+    return fullstack_test_result
 
 
 
@@ -225,14 +323,17 @@ def demo_component_library():
     print_separator("Demo 2: Component Library")
     
     # Create a new agent instance with a different directory
-    components_dir = os.path.join(os.path.dirname(current_dir), 'project', 'frontend', 'component-library')
-    agent = FrontendEngineer(components_dir)
+    components_dir = COMPONENTS_DIR
+    agent = agents.FrontendEngineer.get(components_dir)
     
-    print(f"🤖 Agent Type: {agent.get_agent_type()}")
-    print(f"📂 Working Directory: {agent.working_directory}")
+    _emit(f"🤖 Agent Type: {agent.get_agent_type()}")
+    _emit(f"📂 Working Directory: {agent.working_directory}")
     
     # Test 2: Create a component library
-    result = agent.create_component_library("my-ui-components")
+    result = agent.execute_task(
+        "Create a reusable React component library named my-ui-components with Button, Input, "
+        "Modal and Card components, TypeScript types and a short README showing their usage."
+    )
     print_result(result, "Component Library Creation")
     
     return agent, result
@@ -243,14 +344,17 @@ def demo_dashboard_app():
     print_separator("Demo 3: Admin Dashboard")
     
     # Create a new agent instance
-    dashboard_dir = os.path.join(os.path.dirname(current_dir), 'project', 'frontend', 'admin-dashboard')
-    agent = FrontendEngineer(dashboard_dir)
+    dashboard_dir = DASHBOARD_DIR
+    agent = agents.FrontendEngineer.get(dashboard_dir)
     
-    print(f"🤖 Agent Type: {agent.get_agent_type()}")
-    print(f"📂 Working Directory: {agent.working_directory}")
+    _emit(f"🤖 Agent Type: {agent.get_agent_type()}")
+    _emit(f"📂 Working Directory: {agent.working_directory}")
     
     # Test 3: Create an admin dashboard
-    result = agent.create_dashboard_app("admin")
+    result = agent.execute_task(
+        "Create an admin dashboard React app with a sidebar layout, a users table, "
+        "summary statistic cards and a settings page."
+    )
     print_result(result, "Admin Dashboard Creation")
     
     return agent, result
@@ -260,21 +364,21 @@ def demo_agent_status():
     """Demo: Show agent status"""
     print_separator("Demo 4: Agent Status")
     
-    frontend_dir = os.path.join(os.path.dirname(current_dir), 'project', 'frontend')
-    agent = FrontendEngineer(frontend_dir)
+    frontend_dir = FRONTEND_DIR
+    agent = agents.FrontendEngineer.get(frontend_dir)
     
     status = agent.get_specialized_status()
     
-    print("📊 Agent Status:")
-    print(f"   Agent Type: {status.get('agent_type')}")
-    print(f"   Session ID: {status.get('session_id')}")
-    print(f"   Working Directory: {status.get('working_directory')}")
-    print(f"   Max Turns: {status.get('max_turns')}")
-    print(f"   Conversations: {status.get('conversation_count')}")
-    print(f"   Files in Directory: {status.get('files_in_directory')}")
-    print(f"   Has package.json: {status.get('has_package_json')}")
-    print(f"   Has README: {status.get('has_readme')}")
-    print(f"   Supported Frameworks: {', '.join(status.get('supported_frameworks', []))}")
+    _emit("📊 Agent Status:")
+    _emit(f"   Agent Type: {status.get('agent_type')}")
+    _emit(f"   Session ID: {status.get('session_id')}")
+    _emit(f"   Working Directory: {status.get('working_directory')}")
+    _emit(f"   Max Turns: {status.get('max_turns')}")
+    _emit(f"   Conversations: {status.get('conversation_count')}")
+    _emit(f"   Files in Directory: {status.get('files_in_directory')}")
+    _emit(f"   Has package.json: {status.get('has_package_json')}")
+    _emit(f"   Has README: {status.get('has_readme')}")
+    _emit(f"   Supported Frameworks: {', '.join(status.get('supported_frameworks', []))}")
 
 
 def demo_backend_api():
@@ -282,14 +386,17 @@ def demo_backend_api():
     print_separator("Demo: Backend API")
     
     # Create agent instance pointing to project/backend directory
-    backend_dir = os.path.join(os.path.dirname(current_dir), 'project', 'backend')
-    agent = BackendEngineer(backend_dir)
+    backend_dir = BACKEND_DIR
+    agent = agents.BackendEngineer.get(backend_dir)
     
-    print(f"🤖 Agent Type: {agent.get_agent_type()}")
-    print(f"📂 Working Directory: {agent.working_directory}")
+    _emit(f"🤖 Agent Type: {agent.get_agent_type()}")
+    _emit(f"📂 Working Directory: {agent.working_directory}")
     
     # Test: Create a FastAPI server with authentication
-    result = agent.create_api_server("fastapi", "todo-api", include_auth=True)
+    result = agent.execute_task(
+        "Create a FastAPI server named todo-api with CRUD endpoints for todos and "
+        "JWT authentication (register, login, protected routes)."
+    )
     print_result(result, "FastAPI Server with Authentication")
     
     return agent, result
@@ -300,14 +407,17 @@ def demo_backend_microservice():
     print_separator("Demo: Backend Microservice")
     
     # Create a new agent instance with a different directory
-    microservice_dir = os.path.join(os.path.dirname(current_dir), 'project', 'backend', 'user-microservice')
-    agent = BackendEngineer(microservice_dir)
+    microservice_dir = MICROSERVICE_DIR
+    agent = agents.BackendEngineer.get(microservice_dir)
     
-    print(f"🤖 Agent Type: {agent.get_agent_type()}")
-    print(f"📂 Working Directory: {agent.working_directory}")
+    _emit(f"🤖 Agent Type: {agent.get_agent_type()}")
+    _emit(f"📂 Working Directory: {agent.working_directory}")
     
     # Test: Create a microservice
-    result = agent.create_microservice("user-service", "fastapi")
+    result = agent.execute_task(
+        "Create a FastAPI microservice named user-service with user CRUD endpoints, "
+        "a /health endpoint, requirements.txt and a Dockerfile."
+    )
     print_result(result, "User Microservice Creation")
     
     return agent, result
@@ -317,94 +427,203 @@ def demo_backend_status():
     """Demo: Show backend agent status"""
     print_separator("Demo: Backend Agent Status")
     
-    backend_dir = os.path.join(os.path.dirname(current_dir), 'project', 'backend')
-    agent = BackendEngineer(backend_dir)
+    backend_dir = BACKEND_DIR
+    agent = agents.BackendEngineer.get(backend_dir)
     
     status = agent.get_specialized_status()
     
-    print("📊 Backend Agent Status:")
-    print(f"   Agent Type: {status.get('agent_type')}")
-    print(f"   Session ID: {status.get('session_id')}")
-    print(f"   Working Directory: {status.get('working_directory')}")
-    print(f"   Max Turns: {status.get('max_turns')}")
-    print(f"   Conversations: {status.get('conversation_count')}")
-    print(f"   Files in Directory: {status.get('files_in_directory')}")
-    print(f"   Has Requirements: {status.get('has_requirements')}")
-    print(f"   Has Dockerfile: {status.get('has_dockerfile')}")
-    print(f"   Has Tests: {status.get('has_tests')}")
-    print(f"   Supported Frameworks: {', '.join(status.get('supported_frameworks', [])[:5])}...")
-    print(f"   Supported Databases: {', '.join(status.get('supported_databases', []))}")
-
-
-def main():
+    _emit("📊 Backend Agent Status:")
+    _emit(f"   Agent Type: {status.get('agent_type')}")
+    _emit(f"   Session ID: {status.get('session_id')}")
+    _emit(f"   Working Directory: {status.get('working_directory')}")
+    _emit(f"   Max Turns: {status.get('max_turns')}")
+    _emit(f"   Conversations: {status.get('conversation_count')}")
+    _emit(f"   Files in Directory: {status.get('files_in_directory')}")
+    _emit(f"   Has Requirements: {status.get('has_requirements')}")
+    _emit(f"   Has Dockerfile: {status.get('has_dockerfile')}")
+    _emit(f"   Has Tests: {status.get('has_tests')}")
+    _emit(f"   Supported Frameworks: {', '.join(status.get('supported_frameworks', [])[:5])}...")
+    _emit(f"   Supported Databases: {', '.join(status.get('supported_databases', []))}")
+
+
+def _init_worker_logging():
+    """Log straight to the console in worker processes (the parent's queue listener isn't there)"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout, force=True)
+
+
+def _run_independent_demo(demo) -> Dict[str, Any]:
+    """Run one demo in a worker process and return only its (picklable) result"""
+    _, result = demo()
+    return result
+
+
+_INDEPENDENT_DEMOS = {
+    '1': ("Component Library Creation", demo_component_library),
+    '2': ("Admin Dashboard Creation", demo_dashboard_app),
+    '3': ("User Microservice Creation", demo_backend_microservice),
+}
+
+
+def demo_independent_in_parallel(keys=tuple(_INDEPENDENT_DEMOS), workers: Optional[int] = None) -> List[str]:
+    """Demo: Run the independent demos concurrently, returning the names of those that failed"""
+    print_separator("Demo: Independent Demos in Parallel")
+    
+    # These demos write to separate directories and spend most of their time
+    # waiting on the SDK, so running them side by side takes about as long as
+    # the slowest one instead of the sum of all three.
+    demos = dict(_INDEPENDENT_DEMOS[key] for key in keys)
+    
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers or len(demos), initializer=_init_worker_logging) as pool:
+        futures = {pool.submit(_run_independent_demo, demo): name for name, demo in demos.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            print_result(result, name)
+            if not result.get('success', False):
+                failures.append(name)
+    return failures
+
+
+async def run_demos_concurrently(demos) -> List[str]:
+    """
+    Run independent synchronous demos side by side, one worker thread each
+    
+    Returns:
+        Docstrings of the demos that raised or reported an unsuccessful result
+    """
+    outcomes = await asyncio.gather(*(asyncio.to_thread(demo) for demo in demos), return_exceptions=True)
+    failures = []
+    for demo, outcome in zip(demos, outcomes):
+        if isinstance(outcome, BaseException):
+            _emit(f"\n❌ {demo.__doc__}: {outcome}")
+            failures.append(demo.__doc__)
+        elif not outcome[1].get('success', False):
+            failures.append(demo.__doc__)
+    return failures
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options; anything not given is asked for interactively"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--proceed', action='store_true',
+                        help="start without asking for confirmation")
+    parser.add_argument('--extra', metavar='CHOICES',
+                        help="comma separated additional demos to run, e.g. 1,2,3")
+    parser.add_argument('--non-interactive', action='store_true',
+                        help="never prompt (implies --proceed; no additional demos unless --extra is given)")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="run the selected demos 1-3 across N worker processes instead of threads")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main demo function"""
+    args = parse_args(argv)
+    
+    # Show demo output and the agents' progress messages (e.g. server startup) on the console
+    listener = start_console_logging()
+    try:
+        return run_demos(args)
+    finally:
+        listener.stop()
+
+
+def run_demos(args: argparse.Namespace) -> int:
+    """
+    Demo menu, driven by the command line options or interactive prompts
+    
+    Returns:
+        Process exit status: 0 when every selected demo succeeded
+    """
     print_separator("Agents Demo - Engineering Manager Coordinated Development")
-    print("This demo shows Engineering Manager coordinating Frontend and Backend Engineers.")
-    print("Manager reads specifications and creates aligned instructions for both teams.")
-    print("\nNote: Make sure you have ANTHROPIC_API_KEY set in your environment.")
+    _emit("This demo shows Engineering Manager coordinating Frontend and Backend Engineers.")
+    _emit("Manager reads specifications and creates aligned instructions for both teams.")
+    _emit("\nNote: Make sure you have ANTHROPIC_API_KEY set in your environment.")
     
     # Check if API key is available
     if not os.getenv('ANTHROPIC_API_KEY'):
-        print("\n❌ ERROR: ANTHROPIC_API_KEY environment variable is not set!")
-        print("Please set your API key and try again.")
-        return
+        _emit("\n❌ ERROR: ANTHROPIC_API_KEY environment variable is not set!")
+        _emit("Please set your API key and try again.")
+        return 1
     
-    print(f"\n⏰ Demo started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    _emit(f"\n⏰ Demo started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
         # Default to managed full-stack development demo
-        print("\n👔 Engineering Manager Coordinated Development")
-        print("This demonstrates the Manager → Frontend → Backend coordination workflow.")
-        print("The manager will read SPEC.md and create precise instructions for each team.")
+        _emit("\n👔 Engineering Manager Coordinated Development")
+        _emit("This demonstrates the Manager → Frontend → Backend coordination workflow.")
+        _emit("The manager will read SPEC.md and create precise instructions for each team.")
         
         # Ask user if they want to continue
-        response = input("\nProceed with managed development demo? (y/n): ").lower().strip()
-        if response != 'y':
-            print("Demo cancelled.")
-            return
+        if not (args.proceed or args.non_interactive):
+            response = _ask("\nProceed with managed development demo? (y/n): ").lower().strip()
+            if response != 'y':
+                _emit("Demo cancelled.")
+                return 0
         
         # Run the main demo
-        # demo_result = demo_managed_fullstack_todo_app()
+        # demo_result = asyncio.run(demo_managed_fullstack_todo_app())
         
         # Ask if they want to see more demos
-        print("\n" + "="*60)
-        response = input("Would you like to see additional demos? (y/n): ").lower().strip()
-        if response == 'y':
-            print("\nAdditional demo options:")
-            print("1. Frontend component library")
-            print("2. Frontend dashboard")
-            print("3. Backend microservice")
-            print("4. Agent status info")
-            print("5. Managed Full Stack Development")
-            print("6. Managed Testing Engineer Development")
-            
-            choice = input("Enter choice (1-4): ").strip()
-            
-            if choice == '1':
-                demo_component_library()
-            elif choice == '2':
-                demo_dashboard_app()
-            elif choice == '3':
-                demo_backend_microservice()
-            elif choice == '4':
-                demo_agent_status()
-                demo_backend_status()
-            elif choice == '5':
-                demo_managed_fullstack_todo_app()
-            elif choice == '6':
-                demo_managed_testing_engineer_app()
+        if args.extra is not None:
+            choices = {c.strip() for c in args.extra.split(',')}
+        elif args.non_interactive:
+            choices = set()
+        else:
+            choices = set()
+            _emit("\n" + _SEP)
+            response = _ask("Would you like to see additional demos? (y/n): ").lower().strip()
+            if response == 'y':
+                _emit("\nAdditional demo options:")
+                _emit("1. Frontend component library")
+                _emit("2. Frontend dashboard")
+                _emit("3. Backend microservice")
+                _emit("4. Agent status info")
+                _emit("5. Managed Full Stack Development")
+                _emit("6. Managed Testing Engineer Development")
+                _emit("7. Demos 1-3 in parallel")
+                
+                choices = {c.strip() for c in _ask("Enter choices, comma separated (e.g. 1,2,3): ").split(',')}
+        
+        # Demos 1-3 use separate directories, so whichever were picked run together
+        failures = []
+        independent = [key for key in _INDEPENDENT_DEMOS if key in choices]
+        if independent and args.workers:
+            failures += demo_independent_in_parallel(independent, args.workers)
+        elif independent:
+            failures += asyncio.run(run_demos_concurrently([_INDEPENDENT_DEMOS[key][1] for key in independent]))
+        
+        if '4' in choices:
+            demo_agent_status()
+            demo_backend_status()
+        if '5' in choices and not asyncio.run(demo_managed_fullstack_todo_app()).passed:
+            failures.append("Managed Full Stack Development")
+        if '6' in choices and not demo_managed_testing_engineer_app().get('success', False):
+            failures.append("Managed Testing Engineer Development")
+        if '7' in choices:
+            failures += demo_independent_in_parallel(workers=args.workers)
         
         print_separator("Demo Complete")
-        print("✅ All demos completed successfully!")
-        print("Check the 'project/' directory for the generated full-stack todo application.")
+        if failures:
+            _emit(f"❌ {len(failures)} demo(s) failed: {', '.join(failures)}")
+            return 1
+        _emit("✅ All demos completed successfully!")
+        _emit("Check the 'project/' directory for the generated full-stack todo application.")
+        return 0
         
     except KeyboardInterrupt:
-        print("\n\n⏹️  Demo interrupted by user")
+        _emit("\n\n⏹️  Demo interrupted by user")
+        return 130
     except Exception as e:
-        print(f"\n\n❌ Demo failed with error: {str(e)}")
+        _emit(f"\n\n❌ Demo failed with error: {str(e)}")
         import traceback
         traceback.print_exc()
+        return 1
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -2,60 +2,19 @@
 Engineering Manager Agent - Coordinates frontend and backend development
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import os
+import re
+from typing import Dict, Any, FrozenSet, List, Optional
 from claude_code_sdk import ClaudeCodeOptions
 from .base_agent import BaseAgent
-from .utils import get_project_info, format_file_list
+from .utils import load_json_safely, save_json_safely
 
 
-class EngineeringManager(BaseAgent):
-    """
-    Engineering Manager agent that coordinates frontend and backend development
-    Reads specifications and generates precise instructions for other agents
-    Does not write application code - only creates coordination documentation
-    """
-    
-    def __init__(self, project_directory: str = "project", max_turns: int = 50):
-        """
-        Initialize the Engineering Manager agent
-        
-        Args:
-            project_directory: Directory containing SPEC.md and frontend/backend folders
-            max_turns: Maximum number of turns for Claude Code SDK interactions
-        """
-        super().__init__(project_directory, max_turns)
-        self.agent_name = "Engineering Manager"
-        self.coordination_areas = [
-            "API Contracts", "Data Models", "Port Configuration", "Authentication",
-            "Error Handling", "Development Workflow", "Testing Strategy"
-        ]
-    
-    def get_agent_type(self) -> str:
-        """Return the type/name of this agent"""
-        return "Engineering Manager"
-    
-    async def query_claude_code_sdk(self, prompt: str, options: Optional[ClaudeCodeOptions] = None) -> list:
-        """
-        Override to restrict tool access - no bash commands allowed
-        Engineering Manager should only read specs and write documentation
-        """
-        if options is None:
-            options = ClaudeCodeOptions(
-                max_turns=self.max_turns,
-                allowed_tools=["read", "write", "edit", "grep", "glob"],  # No bash
-                permission_mode="bypassPermissions"
-            )
-        
-        return await super().query_claude_code_sdk(prompt, options)
-    
-    def _enhance_prompt(self, task_description: str) -> str:
-        """
-        Enhance the task description with engineering management context
-        """
-        project_info = get_project_info(self.working_directory)
-        
-        enhanced_prompt = f"""
-You are an Engineering Manager agent working in the directory: {self.working_directory}
+# Static agent context wrapped around every engineering management task
+_PROMPT_PREFIX_TEMPLATE = """
+You are an Engineering Manager agent working in the directory: {working_directory}
 
 IMPORTANT CONTEXT:
 - You coordinate frontend and backend development teams
@@ -73,7 +32,7 @@ ENGINEERING MANAGEMENT RESPONSIBILITIES:
 7. Validate that frontend API calls exactly match backend implementations
 
 COORDINATION AREAS:
-{', '.join(self.coordination_areas)}
+{coordination_areas}
 
 CRITICAL REQUIREMENTS:
 - Always read SPEC.md first to understand requirements
@@ -85,7 +44,9 @@ CRITICAL REQUIREMENTS:
 - CORS settings must allow frontend-backend communication
 
 TASK TO COMPLETE:
-{task_description}
+"""
+
+_PROMPT_SUFFIX = """
 
 Please read the project specification and create coordinated instructions that ensure 
 frontend and backend implementations will work together seamlessly.
@@ -93,68 +54,49 @@ frontend and backend implementations will work together seamlessly.
 IMPORTANT: You should read files and write documentation, but NOT execute any bash commands 
 or write application code. Your role is coordination and specification, not implementation.
 """
-        return enhanced_prompt
-    
-    def coordinate_project(self, specification_file: str = "SPEC.md") -> Dict[str, Any]:
-        """
-        Main coordination method - reads specification and generates instructions for both teams
-        
-        Args:
-            specification_file: Name of the specification file to read
-            
-        Returns:
-            Dictionary containing coordination results
-        """
-        task = f"""
-Read the project specification from {specification_file} and coordinate a full-stack development project.
+
+# coordinate_project writes each team's CLAUDE.md in its own concurrent SDK
+# session, then reconciles the two files with validate_project_alignment
+_COORDINATE_TEAM_TEMPLATE = """
+Read the project specification from {specification_file} and write the {team} team's instructions ({team}/CLAUDE.md).
 
 STEP 1: Read and Analyze Specification
 - Read the {specification_file} file in the current directory
 - Understand the project requirements, features, and technical needs
-- Identify what needs to be built for frontend and backend
+- Identify what needs to be built for the {team}
+
+STEP 2: Generate {title} Instructions ({team}/CLAUDE.md)
+Create detailed instructions for the {team} team including:
+{team_requirements}
+
+STEP 3: Ensure Perfect Alignment
+The {other_team} instructions are being written at the same time from the same specification,
+so derive everything shared directly from {specification_file}:
+- API endpoint paths exactly as the specification names them
+- Data model field names and types exactly as the specification names them
+- Backend API server on port 8000, frontend development server on port 3001
+- Authentication tokens and flows as described in the specification
+- Error response formats as described in the specification
 
-STEP 2: Generate Frontend Instructions (frontend/CLAUDE.md)
-Create detailed instructions for the frontend team including:
-- Exact API endpoints to call (with full URLs including ports)
+Only write {team}/CLAUDE.md - do not create or modify {other_team}/CLAUDE.md.
+Generate precise, actionable instructions that will result in a perfectly coordinated full-stack application.
+"""
+
+_FRONTEND_REQUIREMENTS = """- Exact API endpoints to call (with full URLs including ports)
 - Required data models and TypeScript interfaces
 - Component specifications and user interface requirements
 - Authentication and state management requirements
 - Specific port configuration for development server
-- Integration points with backend services
+- Integration points with backend services"""
 
-STEP 3: Generate Backend Instructions (backend/CLAUDE.md)
-Create detailed instructions for the backend team including:
-- Exact API endpoints to implement (matching frontend calls)
+_BACKEND_REQUIREMENTS = """- Exact API endpoints to implement (matching frontend calls)
 - Database models and schemas (matching frontend data needs)
 - Authentication and authorization implementation
 - CORS configuration to allow frontend access
 - Specific port configuration for API server
-- Data validation and error handling specifications
-
-STEP 4: Ensure Perfect Alignment
-- API endpoint paths must match exactly between frontend and backend
-- Data models must be consistent (same field names, types, validation)
-- Port numbers must be coordinated (no conflicts)
-- Authentication tokens and flows must align
-- Error response formats must be consistent
+- Data validation and error handling specifications"""
 
-Generate both CLAUDE.md files with precise, actionable instructions that will result 
-in a perfectly coordinated full-stack application.
-"""
-        
-        return self.execute_task(task)
-    
-    def validate_project_alignment(self) -> Dict[str, Any]:
-        """
-        Validate that frontend and backend instructions are properly aligned
-        
-        Returns:
-            Dictionary containing validation results
-        """
-        existing_files = self._get_created_files()
-        files_context = format_file_list(existing_files) if existing_files else "No existing files"
-        
-        task = f"""
+_VALIDATE_ALIGNMENT_TEMPLATE = """
 Validate that the frontend and backend instructions are properly coordinated by:
 
 1. Reading both frontend/CLAUDE.md and backend/CLAUDE.md files
@@ -175,6 +117,10 @@ Validate that the frontend and backend instructions are properly coordinated by:
 Current project files:
 {files_context}
 
+Local pre-check hints (regex comparison of endpoints and ports; unverified, so confirm each one
+against both files before changing anything):
+{precheck}
+
 Generate a validation report showing:
 - What is properly aligned
 - Any mismatches or issues found
@@ -183,20 +129,286 @@ Generate a validation report showing:
 
 If issues are found, update the CLAUDE.md files to fix alignment problems.
 """
+
+# Syntactic facts that can be compared without the model
+_ENDPOINT_PATTERN = re.compile(r'\b(GET|POST|PUT|PATCH|DELETE)\s+(/[\w{}/:.-]*)')
+_PATH_PARAM_PATTERN = re.compile(r'\{[^}]*\}|:\w+')
+# Only "localhost:8000", "port 8000", "--port 8000" or "**Port**: 8000", not e.g. "12:00:00"
+_PORT_PATTERN = re.compile(r'\blocalhost:(\d{2,5})\b|\bport\b[\s*:=]*(\d{2,5})\b', re.IGNORECASE)
+
+
+def _alignment_facts(text: str) -> Dict[str, FrozenSet[str]]:
+    """Extract endpoints (with normalized path parameters) and ports"""
+    return {
+        'endpoints': frozenset(
+            f"{method} {_PATH_PARAM_PATTERN.sub('{}', path).rstrip('/') or '/'}"
+            for method, path in _ENDPOINT_PATTERN.findall(text)
+        ),
+        'ports': frozenset(host_port or port for host_port, port in _PORT_PATTERN.findall(text)),
+    }
+
+
+def _alignment_hints(frontend_text: str, backend_text: str) -> List[str]:
+    """
+    List endpoints and ports that appear in only one of the two CLAUDE.md texts
+    
+    These come from regular expressions, so they are hints for the validation
+    task to check, not confirmed mismatches. An empty list means nothing was found.
+    """
+    facts = {'frontend': _alignment_facts(frontend_text), 'backend': _alignment_facts(backend_text)}
+    hints = []
+    for kind in ('endpoints', 'ports'):
+        frontend_only = facts['frontend'][kind] - facts['backend'][kind]
+        backend_only = facts['backend'][kind] - facts['frontend'][kind]
+        if frontend_only:
+            hints.append(f"- {kind.capitalize()} seen only in frontend/CLAUDE.md: {', '.join(sorted(frontend_only))}")
+        if backend_only:
+            hints.append(f"- {kind.capitalize()} seen only in backend/CLAUDE.md: {', '.join(sorted(backend_only))}")
+    return hints
+
+
+# Hashes of SPEC.md and both CLAUDE.md files from the last successful coordination
+_COORDINATION_CACHE_FILE = '.coordination.cache'
+
+
+def _file_digest(path: str) -> Optional[str]:
+    """SHA-256 hex digest of a file, streamed in chunks, or None if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+            return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class EngineeringManager(BaseAgent):
+    """
+    Engineering Manager agent that coordinates frontend and backend development
+    Reads specifications and generates precise instructions for other agents
+    Does not write application code - only creates coordination documentation
+    """
+    
+    def __init__(self, project_directory: str = "project", max_turns: int = 50):
+        """
+        Initialize the Engineering Manager agent
+        
+        Args:
+            project_directory: Directory containing SPEC.md and frontend/backend folders
+            max_turns: Maximum number of turns for Claude Code SDK interactions
+        """
+        super().__init__(project_directory, max_turns)
+        self.agent_name = "Engineering Manager"
+        self.coordination_areas = [
+            "API Contracts", "Data Models", "Port Configuration", "Authentication",
+            "Error Handling", "Development Workflow", "Testing Strategy"
+        ]
+        self._coordination_areas_joined = ', '.join(self.coordination_areas)
+        self._prompt_prefix: Optional[str] = None
+        self._prompt_prefix_key: Optional[Dict[str, Any]] = None
+        
+        # Tool restrictions never change, so build the SDK options once
+        self._default_options = ClaudeCodeOptions(
+            max_turns=self.max_turns,
+            allowed_tools=["read", "write", "edit", "grep", "glob"],  # No bash
+            permission_mode="bypassPermissions",
+            cwd=self.working_directory
+        )
+    
+    def get_agent_type(self) -> str:
+        """Return the type/name of this agent"""
+        return "Engineering Manager"
+    
+    async def query_claude_code_sdk(self, prompt: str, options: Optional[ClaudeCodeOptions] = None) -> list:
+        """
+        Override to restrict tool access - no bash commands allowed
+        Engineering Manager should only read specs and write documentation
+        """
+        if options is None:
+            options = self._default_options
+        
+        return await super().query_claude_code_sdk(prompt, options)
+    
+    def _enhance_prompt(self, task_description: str) -> str:
+        """
+        Enhance the task description with engineering management context
+        """
+        project_info = self._project_info()
+        
+        # Only re-render the static guidance when the project info changed
+        if self._prompt_prefix is None or self._prompt_prefix_key != project_info:
+            self._prompt_prefix = _PROMPT_PREFIX_TEMPLATE.format_map({
+                'working_directory': self.working_directory,
+                'project_info': project_info,
+                'coordination_areas': self._coordination_areas_joined,
+            })
+            self._prompt_prefix_key = project_info
         
-        return self.execute_task(task)
+        return self._prompt_prefix + task_description + _PROMPT_SUFFIX
+    
+    def coordinate_project(self, specification_file: str = "SPEC.md", force: bool = False) -> Dict[str, Any]:
+        """
+        Main coordination method - reads specification and generates instructions for both teams
+        
+        Args:
+            specification_file: Name of the specification file to read
+            force: Regenerate the instructions even if nothing changed since the last run
+            
+        Returns:
+            Dictionary containing coordination results
+        """
+        return self.run_async(self.coordinate_project_async(specification_file, force))
+    
+    async def coordinate_project_async(self, specification_file: str = "SPEC.md", force: bool = False) -> Dict[str, Any]:
+        """
+        Generate frontend/CLAUDE.md and backend/CLAUDE.md in two concurrent SDK sessions
+        
+        The two sessions can't see each other's output, so once both succeed the
+        files are reconciled by a serial validate_project_alignment step.
+        
+        The run is skipped when the specification and both CLAUDE.md files still
+        match the hashes recorded after the last successful coordination.
+        
+        Args:
+            specification_file: Name of the specification file to read
+            force: Regenerate the instructions even if nothing changed since the last run
+            
+        Returns:
+            Dictionary containing coordination results, with each team's own
+            result under 'team_results' and the reconciliation result under 'alignment'
+            ('cached' is True when the run was skipped)
+        """
+        cache_path = os.path.join(self.working_directory, _COORDINATION_CACHE_FILE)
+        hashes = self._coordination_hashes(specification_file)
+        
+        if not force and all(hashes.values()) and load_json_safely(cache_path) == hashes:
+            return {
+                'success': True,
+                'cached': True,
+                'messages': [],
+                'session_id': self.session_id,
+                'working_directory': self.working_directory,
+                'files_created': self._get_created_files(),
+                'team_results': {}
+            }
+        
+        teams = {
+            'frontend': ('backend', _FRONTEND_REQUIREMENTS),
+            'backend': ('frontend', _BACKEND_REQUIREMENTS),
+        }
+        results = await asyncio.gather(*(
+            self.execute_task_async(_COORDINATE_TEAM_TEMPLATE.format(
+                specification_file=specification_file,
+                team=team,
+                title=team.capitalize(),
+                other_team=other_team,
+                team_requirements=requirements
+            ))
+            for team, (other_team, requirements) in teams.items()
+        ))
+        team_results = dict(zip(teams, results))
+        
+        combined = {
+            'success': all(result['success'] for result in results),
+            'messages': [message for result in results for message in result.get('messages', [])],
+            'session_id': self.session_id,
+            'working_directory': self.working_directory,
+            'files_created': self._get_created_files(),
+            'team_results': team_results
+        }
+        errors = [f"{team}: {result['error']}" for team, result in team_results.items() if not result['success']]
+        if errors:
+            combined['error'] = '; '.join(errors)
+            return combined
+        
+        # Reconcile the two independently written files; this may edit either of them
+        alignment = await self.validate_project_alignment_async()
+        combined['alignment'] = alignment
+        combined['messages'].extend(alignment.get('messages', []))
+        combined['files_created'] = self._get_created_files()
+        if not alignment['success']:
+            combined['success'] = False
+            combined['error'] = f"alignment: {alignment['error']}"
+        else:
+            hashes = self._coordination_hashes(specification_file)
+            if all(hashes.values()):
+                save_json_safely(cache_path, hashes)
+        return combined
+    
+    def _coordination_hashes(self, specification_file: str) -> Dict[str, Optional[str]]:
+        """Hash the specification and both teams' CLAUDE.md files (None for missing files)"""
+        return {
+            'spec_hash': _file_digest(os.path.join(self.working_directory, specification_file)),
+            'frontend_hash': _file_digest(os.path.join(self.working_directory, 'frontend', 'CLAUDE.md')),
+            'backend_hash': _file_digest(os.path.join(self.working_directory, 'backend', 'CLAUDE.md')),
+        }
+    
+    def validate_project_alignment(self) -> Dict[str, Any]:
+        """
+        Validate that frontend and backend instructions are properly aligned
+        
+        Returns:
+            Dictionary containing validation results
+        """
+        return self.run_async(self.validate_project_alignment_async())
+    
+    async def validate_project_alignment_async(self) -> Dict[str, Any]:
+        """
+        Async version of validate_project_alignment
+        
+        Returns:
+            Dictionary containing validation results
+        """
+        files_context = self._file_index().formatted
+        
+        task = _VALIDATE_ALIGNMENT_TEMPLATE.format(
+            files_context=files_context,
+            precheck=self._precheck_alignment()
+        )
+        
+        return await self.execute_task_async(task)
+    
+    def _precheck_alignment(self) -> str:
+        """
+        Compare the two CLAUDE.md files locally before asking the model
+        
+        Endpoints and ports that appear in only one file are listed as
+        unverified hints for the validation task to confirm.
+        
+        Returns:
+            Human-readable summary of the hints
+        """
+        texts = {}
+        for team in ('frontend', 'backend'):
+            try:
+                with open(os.path.join(self.working_directory, team, 'CLAUDE.md'), encoding='utf-8') as f:
+                    texts[team] = f.read()
+            except OSError:
+                return f"Skipped: {team}/CLAUDE.md could not be read"
+        
+        hints = _alignment_hints(texts['frontend'], texts['backend'])
+        if not hints:
+            return "No differences in endpoints or ports found; focus on semantic alignment (data models, formats, auth, CORS)."
+        return "\n".join(hints)
     
     def get_specialized_status(self) -> Dict[str, Any]:
         """Get engineering management specific status information"""
         base_status = self.get_status()
-        project_info = get_project_info(self.working_directory)
+        project_info = self._project_info()
+        
+        # Three stats instead of a walk of the whole project tree
+        def exists(*parts: str) -> bool:
+            return os.path.isfile(os.path.join(self.working_directory, *parts))
         
         base_status.update({
             'coordination_areas': self.coordination_areas,
             'project_info': project_info,
-            'has_spec': 'SPEC.md' in self._get_created_files(),
-            'has_frontend_instructions': 'frontend/CLAUDE.md' in self._get_created_files(),
-            'has_backend_instructions': 'backend/CLAUDE.md' in self._get_created_files(),
+            'has_spec': exists('SPEC.md'),
+            'has_frontend_instructions': exists('frontend', 'CLAUDE.md'),
+            'has_backend_instructions': exists('backend', 'CLAUDE.md'),
             'role': 'Coordination and Specification (No Code Implementation)'
         })
         
@@ -2,46 +2,25 @@
 Frontend Engineer Agent - Specialized for frontend development tasks
 """
 
-from typing import Dict, Any
-from .base_agent import BaseAgent
-from .utils import get_project_info, format_file_list
+import asyncio
+import os
+import subprocess
+import tempfile
+import time
+from typing import Dict, Any, Optional, Tuple
+from .base_agent import BaseAgent, NPM_EXECUTABLE
 
 
-class FrontendEngineer(BaseAgent):
-    """
-    Specialized agent for frontend development tasks
-    Can create React, Vue, Angular, or vanilla JavaScript projects
-    """
-    
-    def __init__(self, frontend_directory: str = "project/frontend", max_turns: int = 100):
-        """
-        Initialize the Frontend Engineer agent
-        
-        Args:
-            frontend_directory: Directory where frontend projects will be created
-            max_turns: Maximum number of turns for Claude Code SDK interactions
-        """
-        super().__init__(frontend_directory, max_turns)
-        self.agent_name = "Frontend Engineer"
-        self.supported_frameworks = ["React"]
-    
-    def get_agent_type(self) -> str:
-        """Return the type/name of this agent"""
-        return "Frontend Engineer"
-    
-    def _enhance_prompt(self, task_description: str) -> str:
-        """
-        Enhance the task description with frontend-specific context
-        """
-        project_info = get_project_info(self.working_directory)
-        
-        enhanced_prompt = f"""
-You are a Frontend Engineer agent working in the directory: {self.working_directory}
+SUPPORTED_FRAMEWORKS: Tuple[str, ...] = ("React",)
+
+# Static agent context wrapped around every frontend task
+_PROMPT_PREFIX_TEMPLATE = """
+You are a Frontend Engineer agent working in the directory: {working_directory}
 
 IMPORTANT CONTEXT:
 - You are specifically designed for frontend development tasks
 - You can create complete frontend projects from scratch
-- Supported frameworks: {', '.join(self.supported_frameworks)}
+- Supported frameworks: {frameworks}
 - Current directory info: {project_info}
 
 FRONTEND DEVELOPMENT GUIDELINES:
@@ -57,7 +36,9 @@ FRONTEND DEVELOPMENT GUIDELINES:
 10. Create reusable components and utilities
 
 TASK TO COMPLETE:
-{task_description}
+"""
+
+_PROMPT_SUFFIX = """
 
 Please create all necessary files and folders for a complete, working frontend project.
 Make sure to include:
@@ -70,182 +51,305 @@ Make sure to include:
 
 Focus on creating production-ready code that follows modern frontend development practices.
 """
-        return enhanced_prompt
+
+_ADD_FEATURE_TEMPLATE = """
+Add the following feature to the existing frontend project:
+{feature_description}
+
+Current project files:
+{files_context}
+
+Please analyze the existing code structure and add the new feature following the same patterns and conventions.
+"""
+
+_OPTIMIZE_PERFORMANCE_TEMPLATE = """
+Optimize the performance of the existing frontend project by:
+1. Implementing code splitting and lazy loading
+2. Optimizing bundle size
+3. Adding memoization where appropriate
+4. Optimizing images and assets
+5. Implementing proper caching strategies
+6. Adding performance monitoring
+
+Current project files:
+{files_context}
+
+Please analyze the existing code and implement performance optimizations.
+"""
+
+_ADD_TESTING_TEMPLATE = """
+Add comprehensive testing infrastructure using {testing_framework} to the existing frontend project:
+1. Unit tests for components
+2. Integration tests
+3. Test configuration files
+4. Test utilities and helpers
+5. Sample test files demonstrating best practices
+6. Update package.json with testing scripts
+
+Current project files:
+{files_context}
+
+Please set up a complete testing environment with example tests.
+"""
+
+
+class FrontendEngineer(BaseAgent):
+    """
+    Specialized agent for frontend development tasks
+    Can create React, Vue, Angular, or vanilla JavaScript projects
+    """
+    
+    supported_frameworks = SUPPORTED_FRAMEWORKS
+    _FRAMEWORKS_JOINED = ", ".join(SUPPORTED_FRAMEWORKS)
+    
+    def __init__(self, frontend_directory: str = "project/frontend", max_turns: int = 100):
+        """
+        Initialize the Frontend Engineer agent
+        
+        Args:
+            frontend_directory: Directory where frontend projects will be created
+            max_turns: Maximum number of turns for Claude Code SDK interactions
+        """
+        super().__init__(frontend_directory, max_turns)
+        self.agent_name = "Frontend Engineer"
+        self._prompt_prefix: Optional[str] = None
+        self._prompt_prefix_key: Optional[Dict[str, Any]] = None
+    
+    def get_agent_type(self) -> str:
+        """Return the type/name of this agent"""
+        return "Frontend Engineer"
+    
+    def _enhance_prompt(self, task_description: str) -> str:
+        """
+        Enhance the task description with frontend-specific context
+        """
+        project_info = self._project_info()
+        
+        # Only re-render the static guidance when the project info changed
+        if self._prompt_prefix is None or self._prompt_prefix_key != project_info:
+            self._prompt_prefix = _PROMPT_PREFIX_TEMPLATE.format_map({
+                'working_directory': self.working_directory,
+                'frameworks': self._FRAMEWORKS_JOINED,
+                'project_info': project_info,
+            })
+            self._prompt_prefix_key = project_info
+        
+        return self._prompt_prefix + task_description + _PROMPT_SUFFIX
     
     def add_feature(self, feature_description: str) -> Dict[str, Any]:
         """
         Add a new feature to existing frontend project
         
+        Synchronous wrapper around add_feature_async.
+        
         Args:
             feature_description: Description of the feature to add
             
         Returns:
             Dictionary containing task results
         """
-        existing_files = self._get_created_files()
-        files_context = format_file_list(existing_files) if existing_files else "No existing files"
+        return self.run_async(self.add_feature_async(feature_description))
+    
+    async def add_feature_async(self, feature_description: str) -> Dict[str, Any]:
+        """
+        Add a new feature to existing frontend project without blocking the event loop
         
-        task = f"""
-Add the following feature to the existing frontend project:
-{feature_description}
-
-Current project files:
-{files_context}
-
-Please analyze the existing code structure and add the new feature following the same patterns and conventions.
-"""
+        Args:
+            feature_description: Description of the feature to add
+            
+        Returns:
+            Dictionary containing task results
+        """
+        files_context = self._file_index().formatted
+        
+        task = _ADD_FEATURE_TEMPLATE.format(
+            feature_description=feature_description,
+            files_context=files_context
+        )
         
-        return self.execute_task(task)
+        return await self.execute_task_async(task)
     
     def optimize_performance(self) -> Dict[str, Any]:
         """
         Optimize the performance of existing frontend project
         
+        Synchronous wrapper around optimize_performance_async.
+        
         Returns:
             Dictionary containing task results
         """
-        existing_files = self._get_created_files()
-        files_context = format_file_list(existing_files) if existing_files else "No existing files"
+        return self.run_async(self.optimize_performance_async())
+    
+    async def optimize_performance_async(self) -> Dict[str, Any]:
+        """
+        Optimize the performance of existing frontend project without blocking the event loop
         
-        task = f"""
-Optimize the performance of the existing frontend project by:
-1. Implementing code splitting and lazy loading
-2. Optimizing bundle size
-3. Adding memoization where appropriate
-4. Optimizing images and assets
-5. Implementing proper caching strategies
-6. Adding performance monitoring
-
-Current project files:
-{files_context}
-
-Please analyze the existing code and implement performance optimizations.
-"""
+        Returns:
+            Dictionary containing task results
+        """
+        files_context = self._file_index().formatted
         
-        return self.execute_task(task)
+        task = _OPTIMIZE_PERFORMANCE_TEMPLATE.format(files_context=files_context)
+        
+        return await self.execute_task_async(task)
     
     def add_testing(self, testing_framework: str = "vitest") -> Dict[str, Any]:
         """
         Add testing infrastructure to the project
         
+        Synchronous wrapper around add_testing_async.
+        
         Args:
             testing_framework: Testing framework to use (vitest, jest, cypress, etc.)
             
         Returns:
             Dictionary containing task results
         """
-        existing_files = self._get_created_files()
-        files_context = format_file_list(existing_files) if existing_files else "No existing files"
+        return self.run_async(self.add_testing_async(testing_framework))
+    
+    async def add_testing_async(self, testing_framework: str = "vitest") -> Dict[str, Any]:
+        """
+        Add testing infrastructure to the project without blocking the event loop
         
-        task = f"""
-Add comprehensive testing infrastructure using {testing_framework} to the existing frontend project:
-1. Unit tests for components
-2. Integration tests
-3. Test configuration files
-4. Test utilities and helpers
-5. Sample test files demonstrating best practices
-6. Update package.json with testing scripts
-
-Current project files:
-{files_context}
-
-Please set up a complete testing environment with example tests.
-"""
+        The add_*_async and optimize_performance_async coroutines can be awaited
+        together (e.g. with asyncio.gather) to run feature, performance and
+        testing work in concurrent SDK sessions.
+        
+        Args:
+            testing_framework: Testing framework to use (vitest, jest, cypress, etc.)
+            
+        Returns:
+            Dictionary containing task results
+        """
+        files_context = self._file_index().formatted
+        
+        task = _ADD_TESTING_TEMPLATE.format(
+            testing_framework=testing_framework,
+            files_context=files_context
+        )
         
-        return self.execute_task(task)
+        return await self.execute_task_async(task)
     
     def test_implementation(self) -> Dict[str, Any]:
         """
         Test the frontend implementation by running npm install and npm run dev as background processes
         
+        Synchronous wrapper around test_implementation_async.
+        
         Returns:
             Dictionary containing test results
         """
-        import subprocess
-        import asyncio
-        import time
-        import requests
-        import os
-        from pathlib import Path
+        return self.run_async(self.test_implementation_async())
+    
+    async def test_implementation_async(self) -> Dict[str, Any]:
+        """
+        Test the frontend implementation without blocking the event loop
+        
+        npm install runs as an asyncio subprocess, so other agents on the same
+        loop keep working while dependencies install.
         
+        Returns:
+            Dictionary containing test results
+        """
         try:
-            # Change to working directory
-            original_cwd = os.getcwd()
-            os.chdir(self.working_directory)
-            
             # Check if package.json exists
-            package_json_path = Path(self.working_directory) / "package.json"
-            if not package_json_path.exists():
+            if not os.path.isfile(os.path.join(self.working_directory, "package.json")):
                 return {
                     'success': False,
                     'error': 'No package.json found in project directory',
                     'working_directory': self.working_directory
                 }
             
+            if NPM_EXECUTABLE is None:
+                return {
+                    'success': False,
+                    'error': 'npm not found on PATH; install Node.js to test the frontend',
+                    'working_directory': self.working_directory
+                }
+            
             print(f"📦 Installing dependencies in {self.working_directory}...")
             
             # Run npm install
-            install_process = subprocess.run(
-                ['npm', 'install'],
-                cwd=self.working_directory,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            returncode, output = await self._run_npm_install()
             
-            if install_process.returncode != 0:
+            if returncode != 0:
                 return {
                     'success': False,
-                    'error': f'npm install failed: {install_process.stderr}',
+                    'error': f'npm install failed: {output}',
                     'working_directory': self.working_directory
                 }
             
             print("✅ Dependencies installed successfully")
+            self._invalidate_file_cache()
             print(f"🚀 Starting development server in background...")
             
-            # Start npm run dev as background process
-            dev_process = subprocess.Popen(
-                ['npm', 'run', 'dev'],
-                cwd=self.working_directory,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                preexec_fn=os.setsid if hasattr(os, 'setsid') else None  # Create new process group
-            )
+            # Vite renders and bundles on the first HTTP request, so readiness
+            # is only "the port accepts connections"
+            server_port = 3001
             
-            # Wait for server to start (poll for up to 30 seconds)
-            server_ready = False
-            max_wait_time = 30
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait_time:
+            async def port_open() -> bool:
+                try:
+                    _, writer = await asyncio.wait_for(
+                        asyncio.open_connection('localhost', server_port), timeout=0.3
+                    )
+                except (OSError, asyncio.TimeoutError):
+                    return False
+                writer.close()
                 try:
-                    # Try different common ports
-                    for port in [3001]:
-                        try:
-                            response = requests.get(f'http://localhost:{port}', timeout=2)
-                            if response.status_code == 200:
-                                server_ready = True
-                                server_port = port
-                                break
-                        except requests.exceptions.RequestException:
-                            continue
-                    
-                    if server_ready:
-                        break
-                        
-                    time.sleep(2)
-                except Exception:
-                    time.sleep(2)
+                    await writer.wait_closed()
+                except OSError:
+                    pass  # the connection was only a probe
+                return True
             
-            # Store process info for later cleanup (optional)
-            if hasattr(self, '_background_processes'):
-                self._background_processes.append(dev_process)
-            else:
-                self._background_processes = [dev_process]
+            # Restart rather than reuse this agent's own server from an earlier run,
+            # so the check below only catches listeners that belong to someone else
+            if self._background_processes:
+                await asyncio.to_thread(self._background_processes.terminate_all)
+            
+            # A leftover listener would make any new server look ready
+            if await port_open():
+                return {
+                    'success': False,
+                    'error': f'Port {server_port} is already in use; stop the existing server first',
+                    'working_directory': self.working_directory
+                }
+            
+            # Server output goes to a log file rather than a pipe that nobody reads,
+            # which would stall the server once the pipe buffer fills. Popen, so the
+            # server outlives the event loop that runs this coroutine.
+            with tempfile.NamedTemporaryFile(
+                mode='w', prefix='frontend-server-', suffix='.log', delete=False
+            ) as log_file:
+                dev_process = subprocess.Popen(
+                    [NPM_EXECUTABLE, 'run', 'dev'],
+                    cwd=self.working_directory,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True  # Create new process group
+                )
+            server_log_path = log_file.name
+            
+            # Wait for server to start, backing off from 100ms to 1s between probes (up to 60 seconds)
+            server_ready = False
+            delay = 0.1
+            deadline = time.monotonic() + 60
+            while time.monotonic() < deadline and dev_process.poll() is None:
+                if await port_open():
+                    server_ready = True
+                    break
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 1.0)
+            
+            if dev_process.poll() is not None:
+                return {
+                    'success': False,
+                    'error': f'npm run dev exited with code {dev_process.returncode}; see {server_log_path}',
+                    'log_file': server_log_path,
+                    'working_directory': self.working_directory
+                }
             
-            # Change back to original directory
-            os.chdir(original_cwd)
+            # Track the server so close() can stop it
+            self._background_processes.register(dev_process, server_log_path)
             
             if server_ready:
                 return {
@@ -253,30 +357,29 @@ Please set up a complete testing environment with example tests.
                     'message': f'Frontend server started successfully on port {server_port}',
                     'server_url': f'http://localhost:{server_port}',
                     'process_id': dev_process.pid,
+                    'log_file': server_log_path,
                     'working_directory': self.working_directory,
                     'files_created': self._get_created_files()
                 }
             else:
-                # Server didn't start in time, but process might still be running
+                # Server didn't start in time, but process is still running
                 return {
                     'success': True,
                     'message': 'Frontend server started but may still be initializing',
                     'process_id': dev_process.pid,
+                    'log_file': server_log_path,
                     'working_directory': self.working_directory,
                     'files_created': self._get_created_files(),
                     'note': 'Server may take additional time to fully start up'
                 }
                 
-        except subprocess.TimeoutExpired:
-            os.chdir(original_cwd)
+        except asyncio.TimeoutError:
             return {
                 'success': False,
                 'error': 'npm install timed out after 5 minutes',
                 'working_directory': self.working_directory
             }
         except Exception as e:
-            if 'original_cwd' in locals():
-                os.chdir(original_cwd)
             return {
                 'success': False,
                 'error': f'Test implementation failed: {str(e)}',
@@ -286,7 +389,7 @@ Please set up a complete testing environment with example tests.
     def get_specialized_status(self) -> Dict[str, Any]:
         """Get frontend-specific status information"""
         base_status = self.get_status()
-        project_info = get_project_info(self.working_directory)
+        project_info = self._project_info()
         
         base_status.update({
             'supported_frameworks': self.supported_frameworks,
@@ -2,65 +2,24 @@
 Product Manager Agent - Creates project specifications from user requests
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from claude_code_sdk import ClaudeCodeOptions
 from .base_agent import BaseAgent
-from .utils import get_project_info, format_file_list
 
 
-class ProductManager(BaseAgent):
-    """
-    Product Manager agent that creates comprehensive project specifications
-    Takes user requests and generates detailed SPEC.md files
-    Does not write application code - only creates specifications and requirements
-    """
-    
-    def __init__(self, project_directory: str = "project", max_turns: int = 50):
-        """
-        Initialize the Product Manager agent
-        
-        Args:
-            project_directory: Directory where SPEC.md will be created/updated
-            max_turns: Maximum number of turns for Claude Code SDK interactions
-        """
-        super().__init__(project_directory, max_turns)
-        self.agent_name = "Product Manager"
-        self.analysis_areas = [
-            "Problem Analysis", "User Stories", "Requirements", "Technical Architecture",
-            "Data Models", "User Experience", "Quality Requirements", "Success Criteria"
-        ]
-    
-    def get_agent_type(self) -> str:
-        """Return the type/name of this agent"""
-        return "Product Manager"
-    
-    async def query_claude_code_sdk(self, prompt: str, options: Optional[ClaudeCodeOptions] = None) -> list:
-        """
-        Override to restrict tool access - no bash commands allowed
-        Product Manager should only read existing specs and write documentation
-        """
-        if options is None:
-            options = ClaudeCodeOptions(
-                max_turns=self.max_turns,
-                allowed_tools=["read", "write", "edit", "grep", "glob"],  # No bash
-                permission_mode="bypassPermissions"
-            )
-        
-        return await super().query_claude_code_sdk(prompt, options)
-    
-    def _enhance_prompt(self, user_request: str) -> str:
-        """
-        Enhance the user request with Product Manager context and structured analysis
-        """
-        project_info = get_project_info(self.working_directory)
-        
-        enhanced_prompt = f"""
+ANALYSIS_AREAS: Tuple[str, ...] = (
+    "Problem Analysis", "User Stories", "Requirements", "Technical Architecture",
+    "Data Models", "User Experience", "Quality Requirements", "Success Criteria"
+)
+
+# Static agent context wrapped around every product management task
+_PROMPT_TEMPLATE = """
 You are an experienced Product Manager at a tech company. A stakeholder has come to you with this request:
 
 "{user_request}"
 
 IMPORTANT CONTEXT:
-- You are working in the directory: {self.working_directory}
+- You are working in the directory: {working_directory}
 - You create comprehensive project specifications (SPEC.md files)
 - You do NOT write application code - only specifications and requirements
 - Current directory info: {project_info}
@@ -74,7 +33,7 @@ PRODUCT MANAGER RESPONSIBILITIES:
 6. Ensure specifications are clear, actionable, and complete
 
 ANALYSIS AREAS:
-{', '.join(self.analysis_areas)}
+{analysis_areas}
 
 Please analyze this request and create a comprehensive project specification in SPEC.md format. Structure your response as follows:
 
@@ -126,19 +85,8 @@ CRITICAL REQUIREMENTS:
 
 Please create a complete, implementable specification that covers all aspects needed for a development team to build this project successfully.
 """
-        return enhanced_prompt
-    
-    def create_specification(self, user_request: str) -> Dict[str, Any]:
-        """
-        Main method to create project specification from user request
-        
-        Args:
-            user_request: The stakeholder's project request
-            
-        Returns:
-            Dictionary containing specification creation results
-        """
-        task = f"""
+
+_CREATE_SPECIFICATION_TEMPLATE = """
 Create a comprehensive project specification based on the following user request.
 
 USER REQUEST: {user_request}
@@ -176,20 +124,8 @@ STEP 3: Ensure Completeness
 
 Create a specification that serves as the single source of truth for the entire development project.
 """
-        
-        return self.execute_task(task)
-    
-    def validate_specification(self) -> Dict[str, Any]:
-        """
-        Validate that the created specification is complete and actionable
-        
-        Returns:
-            Dictionary containing validation results
-        """
-        existing_files = self._get_created_files()
-        files_context = format_file_list(existing_files) if existing_files else "No existing files"
-        
-        task = f"""
+
+_VALIDATE_SPECIFICATION_TEMPLATE = """
 Validate the project specification by checking for completeness and clarity:
 
 1. Read the SPEC.md file in the current directory
@@ -228,18 +164,98 @@ Generate a validation report showing:
 
 If issues are found, update the SPEC.md file to address them.
 """
+
+
+class ProductManager(BaseAgent):
+    """
+    Product Manager agent that creates comprehensive project specifications
+    Takes user requests and generates detailed SPEC.md files
+    Does not write application code - only creates specifications and requirements
+    """
+    
+    analysis_areas = ANALYSIS_AREAS
+    _ANALYSIS_AREAS_JOINED = ", ".join(ANALYSIS_AREAS)
+    
+    def __init__(self, project_directory: str = "project", max_turns: int = 50):
+        """
+        Initialize the Product Manager agent
+        
+        Args:
+            project_directory: Directory where SPEC.md will be created/updated
+            max_turns: Maximum number of turns for Claude Code SDK interactions
+        """
+        super().__init__(project_directory, max_turns)
+        self.agent_name = "Product Manager"
+    
+    def get_agent_type(self) -> str:
+        """Return the type/name of this agent"""
+        return "Product Manager"
+    
+    async def query_claude_code_sdk(self, prompt: str, options: Optional[ClaudeCodeOptions] = None) -> list:
+        """
+        Override to restrict tool access - no bash commands allowed
+        Product Manager should only read existing specs and write documentation
+        """
+        if options is None:
+            options = ClaudeCodeOptions(
+                max_turns=self.max_turns,
+                allowed_tools=["read", "write", "edit", "grep", "glob"],  # No bash
+                permission_mode="bypassPermissions"
+            )
+        
+        return await super().query_claude_code_sdk(prompt, options)
+    
+    def _enhance_prompt(self, user_request: str) -> str:
+        """
+        Enhance the user request with Product Manager context and structured analysis
+        """
+        project_info = self._project_info()
+        
+        return _PROMPT_TEMPLATE.format_map({
+            'user_request': user_request,
+            'working_directory': self.working_directory,
+            'project_info': project_info,
+            'analysis_areas': self._ANALYSIS_AREAS_JOINED,
+        })
+    
+    def create_specification(self, user_request: str) -> Dict[str, Any]:
+        """
+        Main method to create project specification from user request
+        
+        Args:
+            user_request: The stakeholder's project request
+            
+        Returns:
+            Dictionary containing specification creation results
+        """
+        task = _CREATE_SPECIFICATION_TEMPLATE.format(user_request=user_request)
+        
+        return self.execute_task(task)
+    
+    def validate_specification(self) -> Dict[str, Any]:
+        """
+        Validate that the created specification is complete and actionable
+        
+        Returns:
+            Dictionary containing validation results
+        """
+        files_context = self._file_index().formatted
+        
+        task = _VALIDATE_SPECIFICATION_TEMPLATE.format(files_context=files_context)
         
         return self.execute_task(task)
     
     def get_specialized_status(self) -> Dict[str, Any]:
         """Get Product Manager specific status information"""
         base_status = self.get_status()
-        project_info = get_project_info(self.working_directory)
+        project_info = self._project_info()
+        index = self._file_index()  # one snapshot for the membership test and the listing
         
         base_status.update({
             'analysis_areas': self.analysis_areas,
             'project_info': project_info,
-            'has_spec': 'SPEC.md' in self._get_created_files(),
+            'has_spec': 'SPEC.md' in index.names,
+            'created_files': index.files,
             'spec_file_path': f"{self.working_directory}/SPEC.md",
             'role': 'Specification Creation (No Code Implementation)'
         })
@@ -2,15 +2,56 @@
 Testing Engineer Agent - Specialized for browser-based testing using Playwright
 """
 
+import dataclasses
+import json
+import logging
+import os
+import tempfile
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from claude_code_sdk import ClaudeCodeOptions
+from .agent_pool import MAX_PARALLEL_AGENTS, run_parallel
 from .base_agent import BaseAgent
-from .utils import get_project_info, format_file_list
-import os
+from .utils import ensure_directory, get_project_info, format_file_list
 from claude_code_sdk import query
 
-import uuid
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# Session transcripts are debugging aids, so they live outside the project
+# (where they would show up in files_created) and only the newest are kept
+DEFAULT_TRANSCRIPT_DIRECTORY = os.path.join(tempfile.gettempdir(), 'testing-engineer-transcripts')
+_TRANSCRIPT_LIMIT = 50
+
+
+def _jsonable(obj: Any) -> Any:
+    """json.dumps fallback: SDK messages and content blocks are dataclasses"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return str(obj)
+
+
+_GUIDED_WEB_TEST_TEMPLATE = """
+1. Navigate to {url} using Playwright browser automation
+2. {test_prompt}
+3. Document all issues or failures - DO NOT save screenshots
+4. Save the analysis in analysis/{report_name}
+"""
+
+_FULL_WEB_TEST_TEMPLATE = """
+Test the web application at {url} comprehensively:
+1. Navigate to the application
+2. Test all interactive elements and user flows
+3. Verify page functionality and navigation
+4. Document all findings, issues, or test results - DO NOT save screenshots
+5. Save the analysis in analysis/{report_name}
+"""
+
+# Keyed on whether the caller supplied specific test instructions
+_WEB_TEST_TEMPLATES = {True: _GUIDED_WEB_TEST_TEMPLATE, False: _FULL_WEB_TEST_TEMPLATE}
+
 
 class TestingEngineer(BaseAgent):
     """
@@ -18,24 +59,76 @@ class TestingEngineer(BaseAgent):
     Uses Playwright MCP for comprehensive browser testing and QA
     """
     
-    def __init__(self, testing_directory: str = "project/testing", max_turns: int = 100):
+    _ALLOWED_TOOLS = ("read", "write")
+    
+    # Playwright MCP tools the testing sessions may call
+    _MCP_TOOLS = (
+        # Essential browser automation
+        "mcp__playwright__browser_navigate",
+        "mcp__playwright__browser_snapshot", 
+        "mcp__playwright__browser_click",
+        "mcp__playwright__browser_type",
+        "mcp__playwright__browser_take_screenshot",
+        "mcp__playwright__browser_wait_for",
+        "mcp__playwright__browser_evaluate",
+        
+        # Navigation and interaction
+        "mcp__playwright__browser_navigate_back",
+        "mcp__playwright__browser_navigate_forward",
+        "mcp__playwright__browser_hover",
+        "mcp__playwright__browser_press_key",
+        "mcp__playwright__browser_select_option",
+        "mcp__playwright__browser_drag",
+        
+        # Advanced features
+        "mcp__playwright__browser_network_requests",
+        "mcp__playwright__browser_console_messages",
+        "mcp__playwright__browser_handle_dialog",
+        "mcp__playwright__browser_file_upload",
+        "mcp__playwright__browser_close",
+        "mcp__playwright__browser_resize",
+        
+        # Tab management
+        "mcp__playwright__browser_tab_list",
+        "mcp__playwright__browser_tab_new",
+        "mcp__playwright__browser_tab_select",
+        "mcp__playwright__browser_tab_close",
+    )
+    
+    _MCP_SERVERS = {
+        "playwright": {
+            "type": "stdio",
+            "command": "npx",
+            # In-memory browser profile, so concurrent sessions don't share a user-data dir
+            "args": ["@playwright/mcp@latest", "--isolated"],
+            "env": {}
+        }
+    }
+    
+    def __init__(self, testing_directory: str = "project/testing", max_turns: int = 100,
+                 transcript_directory: str = DEFAULT_TRANSCRIPT_DIRECTORY):
         """
         Initialize the Testing Engineer agent
         
         Args:
             testing_directory: Directory where test results and reports will be created
             max_turns: Maximum number of turns for Claude Code SDK interactions
+            transcript_directory: Where session transcripts are saved (outside the project by default)
         """
         super().__init__(testing_directory, max_turns)
         self.agent_name = "Testing Engineer"
-        self.mcp_servers = {
-            "playwright": {
-                "type": "stdio",
-                "command": "npx",
-                "args": ["@playwright/mcp@latest"],
-                "env": {}
-            }
-        }
+        self.transcript_directory = transcript_directory
+        self.mcp_servers = self._MCP_SERVERS
+        
+        # Nothing in the Playwright session options changes between tests, so build them once
+        self._playwright_options = ClaudeCodeOptions(
+            max_turns=self.max_turns,
+            cwd=Path(self.working_directory),
+            mcp_servers=self.mcp_servers,
+            permission_mode="bypassPermissions",
+            allowed_tools=list(self._ALLOWED_TOOLS),  # the SDK declares list[str] fields
+            mcp_tools=list(self._MCP_TOOLS)
+        )
     
     def get_agent_type(self) -> str:
         """Return the type/name of this agent"""
@@ -43,68 +136,63 @@ class TestingEngineer(BaseAgent):
     
     async def query_claude_code_sdk_with_playwright(self, prompt: str) -> List[Any]:
         """Query Claude Code SDK with Playwright MCP server support"""
-        
-        options = ClaudeCodeOptions(
-            max_turns=self.max_turns,
-            cwd=Path(self.working_directory),
-            mcp_servers=self.mcp_servers,
-            permission_mode="bypassPermissions",
-            allowed_tools=["read", "write"],
-            mcp_tools=[
-                # Essential browser automation
-                "mcp__playwright__browser_navigate",
-                "mcp__playwright__browser_snapshot", 
-                "mcp__playwright__browser_click",
-                "mcp__playwright__browser_type",
-                "mcp__playwright__browser_take_screenshot",
-                "mcp__playwright__browser_wait_for",
-                "mcp__playwright__browser_evaluate",
-                
-                # Navigation and interaction
-                "mcp__playwright__browser_navigate_back",
-                "mcp__playwright__browser_navigate_forward",
-                "mcp__playwright__browser_hover",
-                "mcp__playwright__browser_press_key",
-                "mcp__playwright__browser_select_option",
-                "mcp__playwright__browser_drag",
-                
-                # Advanced features
-                "mcp__playwright__browser_network_requests",
-                "mcp__playwright__browser_console_messages",
-                "mcp__playwright__browser_handle_dialog",
-                "mcp__playwright__browser_file_upload",
-                "mcp__playwright__browser_close",
-                "mcp__playwright__browser_resize",
-                
-                # Tab management
-                "mcp__playwright__browser_tab_list",
-                "mcp__playwright__browser_tab_new",
-                "mcp__playwright__browser_tab_select",
-                "mcp__playwright__browser_tab_close"
-            ]
-        )
-        
         messages = []
         try:
-            # Change to working directory before querying
-            original_cwd = os.getcwd()
-            os.chdir(self.working_directory)
-            
-            async for message in query(prompt=prompt, options=options):
-                print(message)
+            # options.cwd places the session in the working directory
+            async for message in query(prompt=prompt, options=self._playwright_options):
+                logger.debug("%r", message)  # repr is only built when debug logging is on
                 messages.append(message)
-                
-            # Change back to original directory
-            os.chdir(original_cwd)
             
         except Exception as e:
-            # Change back to original directory even on error
-            if 'original_cwd' in locals():
-                os.chdir(original_cwd)
             raise Exception(f"Claude Code SDK error: {str(e)}")
         
         return messages
 
+    def _save_transcript(self, messages: List[Any], timestamp: int) -> Optional[str]:
+        """
+        Write a test session's SDK messages to <transcript_directory>/session-<timestamp>.jsonl
+        
+        Only the newest _TRANSCRIPT_LIMIT transcripts are kept.
+        
+        Args:
+            messages: Messages returned by the Playwright query
+            timestamp: Session timestamp (ns) used in the file name
+            
+        Returns:
+            Path of the transcript, or None if it could not be written
+        """
+        path = os.path.join(self.transcript_directory, f'session-{timestamp}.jsonl')
+        try:
+            ensure_directory(self.transcript_directory)
+            with open(path, 'w', encoding='utf-8') as f:
+                for message in messages:
+                    f.write(json.dumps(message, default=_jsonable))
+                    f.write('\n')
+        except OSError as e:
+            logger.warning("Could not save test transcript to %s: %s", path, e)
+            return None
+        
+        self._prune_transcripts()
+        return path
+    
+    def _prune_transcripts(self) -> None:
+        """Delete all but the newest _TRANSCRIPT_LIMIT transcripts"""
+        try:
+            with os.scandir(self.transcript_directory) as entries:
+                transcripts = [
+                    (entry.stat().st_mtime_ns, entry.path) for entry in entries
+                    if entry.name.startswith('session-') and entry.name.endswith('.jsonl')
+                ]
+        except OSError:
+            return
+        
+        transcripts.sort()
+        for _, stale_path in transcripts[:-_TRANSCRIPT_LIMIT]:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass  # already removed by a concurrent prune
+    
     def _enhance_prompt(self, task_description: str) -> str:
         """
         Enhance the task description with agent-specific context
@@ -117,45 +205,56 @@ class TestingEngineer(BaseAgent):
         """
         return task_description
     
-    def test_web_application(self, url: str, test_prompt: Optional[str] = None) -> Dict[str, Any]:
+    def test_web_application(self, url: str, test_prompt: Optional[str] = None,
+                             report_name: str = "fixes.MD") -> Dict[str, Any]:
         """
         Test a web application using browser automation
         
+        Synchronous wrapper around test_web_application_async.
+        
         Args:
             url: URL of the web application to test
             test_prompt: Optional specific test instructions
+            report_name: File name of the analysis written under analysis/
             
         Returns:
             Dictionary containing test results
         """
-        if test_prompt:
-            task = f"""
-1. Navigate to {url} using Playwright browser automation
-2. {test_prompt}
-3. Document all issues or failures - DO NOT save screenshots
-4. Save the analysis in analysis/fixes.MD
-"""
-        else:
-            task = f"""
-Test the web application at {url} comprehensively:
-1. Navigate to the application
-2. Test all interactive elements and user flows
-3. Verify page functionality and navigation
-4. Document all findings, issues, or test results - DO NOT save screenshots
-5. Save the analysis in analysis/fixes.MD
-"""
+        return self.run_async(self.test_web_application_async(url, test_prompt, report_name))
+    
+    async def test_web_application_async(self, url: str, test_prompt: Optional[str] = None,
+                                         report_name: str = "fixes.MD") -> Dict[str, Any]:
+        """
+        Test a web application using browser automation without blocking the event loop
+        
+        Args:
+            url: URL of the web application to test
+            test_prompt: Optional specific test instructions
+            report_name: File name of the analysis written under analysis/
+            
+        Returns:
+            Dictionary containing test results
+        """
+        task = _WEB_TEST_TEMPLATES[bool(test_prompt)].format(
+            url=url, test_prompt=test_prompt, report_name=report_name
+        )
         
         try:
-            messages = self.run_async(self.query_claude_code_sdk_with_playwright(
-                self._enhance_prompt(task)
-            ))
+            messages = await self.query_claude_code_sdk_with_playwright(self._enhance_prompt(task))
+            timestamp = time.time_ns()
+            transcript_path = self._save_transcript(messages, timestamp)
             
-            # Store conversation history
+            # Tests may have written screenshots or reports
+            self._invalidate_file_cache()
+            
+            # Store conversation history; the full transcript lives on disk, not in memory
             self.conversation_history.append({
                 'task': task,
                 'url': url,
-                'messages': messages,
-                'timestamp': uuid.uuid4().hex
+                'message_count': len(messages),
+                'last_message': messages[-1] if messages else None,
+                'transcript_path': transcript_path,
+                'timestamp': timestamp
             })
             
             return {
@@ -173,3 +272,27 @@ Test the web application at {url} comprehensively:
                 'session_id': self.session_id,
                 'working_directory': self.working_directory
             }
+    
+    async def test_many(self, scenarios: List[Dict[str, Any]], max_parallel: int = MAX_PARALLEL_AGENTS) -> List[Dict[str, Any]]:
+        """
+        Run several browser test scenarios concurrently
+        
+        Each scenario gets its own SDK session, isolated Playwright MCP server and
+        report file (analysis/fixes-<n>.MD unless the scenario names one), so
+        total time approaches the slowest scenario rather than the sum.
+        
+        Args:
+            scenarios: Keyword arguments for test_web_application_async, e.g.
+                {'url': 'http://localhost:3001', 'test_prompt': '...'}
+            max_parallel: Maximum number of browser sessions running at the same time
+            
+        Returns:
+            One result dictionary per scenario, in order
+        """
+        return await run_parallel(
+            (
+                self.test_web_application_async(**{'report_name': f"fixes-{index}.MD", **scenario})
+                for index, scenario in enumerate(scenarios, 1)
+            ),
+            max_parallel=max_parallel
+        )
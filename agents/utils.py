@@ -2,9 +2,20 @@
 Utility functions for agents
 """
 
+import asyncio
+import heapq
 import os
 import json
-from typing import Dict, List, Any, Optional
+import stat
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import orjson  # optional, several times faster than the stdlib encoder/decoder
+except ImportError:
+    orjson = None
 
 
 def ensure_directory(path: str) -> None:
@@ -12,81 +23,369 @@ def ensure_directory(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+# Files up to this size are read with raw os.read calls; larger ones stream through io
+_MAX_RAW_READ = 64 * 1024 * 1024
+
+
+def _read_file_raw(file_path: str) -> Optional[bytes]:
+    """
+    Read a whole file as bytes with os.open/os.read, sized from fstat
+    
+    Returns None for files over _MAX_RAW_READ so the caller can fall back to
+    buffered io. Raises OSError like open() does.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size > _MAX_RAW_READ:
+            return None
+        
+        chunks = []
+        remaining = size
+        while True:
+            # Ask for one extra byte so a file that grew is still read to EOF
+            chunk = os.read(fd, max(remaining, 0) + 1)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
 def read_file_safely(file_path: str) -> Optional[str]:
     """Safely read a file, returning None if file doesn't exist"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        data = _read_file_raw(file_path)
+        if data is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        
+        text = data.decode('utf-8')
+        if '\r' in text:
+            # Same universal-newline translation as text-mode open()
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
     except (FileNotFoundError, IOError, UnicodeDecodeError):
         return None
 
 
+def _write_file_atomic(file_path: str, payload: bytes) -> None:
+    """
+    Write bytes to a temporary file next to file_path, fsync it, then rename it into place
+    
+    Readers see either the old file or the complete new one, never a partial
+    write. Like open(file_path, 'w'), a symlink has its target rewritten and an
+    existing file keeps its permission bits. Raises OSError; the temporary file
+    is removed on failure.
+    """
+    # Rename over the symlink's target, not the link itself
+    file_path = os.path.realpath(file_path)
+    parent_dir = os.path.dirname(file_path)
+    if parent_dir:
+        ensure_directory(parent_dir)
+    
+    try:
+        existing_mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        existing_mode = None
+    
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        try:
+            if existing_mode is not None:
+                os.fchmod(fd, existing_mode)
+            view = memoryview(payload)
+            written = 0
+            while written < len(view):
+                written += os.write(fd, view[written:])
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def write_file_safely(file_path: str, content: str) -> bool:
     """Safely write content to a file, creating directories if needed"""
     try:
-        # Ensure parent directory exists
-        parent_dir = os.path.dirname(file_path)
-        if parent_dir:
-            ensure_directory(parent_dir)
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        _write_file_atomic(file_path, content.encode('utf-8'))
         return True
     except (IOError, UnicodeEncodeError):
         return False
 
 
+def write_file_safely_bytes(file_path: str, content: bytes) -> bool:
+    """Safely write already-encoded content to a file, creating directories if needed"""
+    try:
+        _write_file_atomic(file_path, content)
+        return True
+    except IOError:
+        return False
+
+
 def load_json_safely(file_path: str) -> Optional[Dict[str, Any]]:
     """Safely load JSON from a file"""
-    content = read_file_safely(file_path)
-    if content is None:
+    # Both parsers take UTF-8 bytes, so skip the text layer entirely
+    try:
+        data = _read_file_raw(file_path)
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+    except OSError:
         return None
     
     try:
-        return json.loads(content)
-    except json.JSONDecodeError:
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    except ValueError:
+        # JSONDecodeError (both libraries) and UnicodeDecodeError are ValueErrors
         return None
 
 
-def save_json_safely(file_path: str, data: Dict[str, Any], indent: int = 2) -> bool:
-    """Safely save data as JSON to a file"""
+def _encode_json(data: Any, indent: int = 2) -> Optional[bytes]:
+    """
+    Encode data as UTF-8 JSON bytes, or None if it isn't serializable
+    
+    orjson is used when available, with the stdlib encoder as the fallback for
+    anything orjson rejects (e.g. integers wider than 64 bits), so the same
+    data is accepted either way. One difference remains: orjson writes NaN and
+    Infinity as null, where the stdlib writes the non-standard NaN/Infinity.
+    """
+    # orjson only knows a 2-space indent; other widths use the stdlib encoder
+    if orjson is not None and indent == 2:
+        try:
+            # Passthrough makes orjson reject datetimes and dataclasses like the stdlib does
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                                | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        except orjson.JSONEncodeError:
+            pass
+    
     try:
-        json_content = json.dumps(data, indent=indent, ensure_ascii=False)
-        return write_file_safely(file_path, json_content)
+        return json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
     except (TypeError, ValueError):
+        return None
+
+
+def save_json_safely(file_path: str, data: Dict[str, Any], indent: int = 2) -> bool:
+    """Safely save data as JSON to a file"""
+    json_content = _encode_json(data, indent)
+    if json_content is None:
         return False
+    return write_file_safely_bytes(file_path, json_content)
 
 
-def get_file_tree(directory: str, ignore_patterns: Optional[List[str]] = None) -> Dict[str, Any]:
-    """Get a tree structure of files in a directory"""
-    if ignore_patterns is None:
-        ignore_patterns = ['.git', '__pycache__', 'node_modules', '.DS_Store']
+def save_json_many(items: List[Tuple[str, Dict[str, Any]]], indent: int = 2, max_workers: int = 8) -> List[bool]:
+    """
+    Save several JSON files at once
     
-    def should_ignore(name: str) -> bool:
-        return any(pattern in name for pattern in ignore_patterns)
+    Everything is serialized up front, then the atomic writes (each ending in
+    an fsync) run on a small thread pool so their disk waits overlap.
     
-    def build_tree(path: str) -> Dict[str, Any]:
-        tree = {'type': 'directory', 'children': {}}
+    Args:
+        items: (file_path, data) pairs
+        indent: JSON indentation width
+        max_workers: Maximum number of files written at the same time
         
+    Returns:
+        One success flag per item, in order
+    """
+    payloads = [(file_path, _encode_json(data, indent)) for file_path, data in items]
+    
+    def write(item: Tuple[str, Optional[bytes]]) -> bool:
+        file_path, payload = item
+        return payload is not None and write_file_safely_bytes(file_path, payload)
+    
+    if len(payloads) <= 1:
+        return [write(item) for item in payloads]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(payloads))) as pool:
+        return list(pool.map(write, payloads))
+
+
+_DEFAULT_IGNORE_PATTERNS = ('.git', '__pycache__', 'node_modules', '.DS_Store')
+
+
+def _compile_ignore_patterns(ignore_patterns: Tuple[str, ...]):
+    """
+    Compile substring ignore patterns into one regex search function
+    
+    A single alternation runs in C instead of a Python-level substring test per
+    pattern. Returns None when there is nothing to ignore.
+    """
+    if not ignore_patterns:
+        return None
+    return re.compile('|'.join(map(re.escape, ignore_patterns))).search
+
+
+def _links_into_ancestry(directory: str, link_path: str) -> bool:
+    """True if the directory symlink at link_path resolves to directory or one of its ancestors"""
+    target = os.path.realpath(link_path)
+    return os.path.commonpath([os.path.realpath(directory), target]) == target
+
+
+def _scan_tree(directory: str, ignore_patterns: Tuple[str, ...],
+               build_tree: bool, collect_info: bool) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Walk a directory once with os.scandir, building the file tree and/or the summary counts
+    
+    Names matching ignore_patterns are left out of the tree. When collect_info is
+    set they are still descended and counted, since the summary covers every file.
+    
+    Symlinked directories are followed in the tree (unless the link leads back
+    into its own ancestry), but, like os.walk, not descended for the summary.
+    
+    Returns:
+        Tuple of (tree or None, dict with file_count/has_package_json/has_readme/has_git
+        and an 'error' key if the root itself could not be read)
+    """
+    ignore_search = _compile_ignore_patterns(ignore_patterns)
+    
+    root = {'type': 'directory', 'children': {}} if build_tree else None
+    # Summary counters live in locals rather than a dict for the per-file hot loop
+    file_count = 0
+    has_package_json = has_readme = has_git = False
+    error = None
+    
+    # Explicit stack instead of recursion; each entry is
+    # (path, tree node to fill or None, whether its files count toward the summary)
+    stack = [(directory, root, collect_info)]
+    while stack:
+        path, tree, counted = stack.pop()
+        at_root = path == directory
         try:
-            for item in os.listdir(path):
-                if should_ignore(item):
-                    continue
-                
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    tree['children'][item] = build_tree(item_path)
-                else:
-                    tree['children'][item] = {'type': 'file'}
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    ignored = ignore_search is not None and ignore_search(name) is not None
+                    parent = tree if tree is not None and not ignored else None
+                    if parent is None and not counted:
+                        continue
+                    if at_root and name == '.git':
+                        has_git = True  # seen in the listing, no extra stat
+                    
+                    # The dirent already says whether this is a real directory
+                    if entry.is_dir(follow_symlinks=False):
+                        subtree = None
+                        if parent is not None:
+                            subtree = {'type': 'directory', 'children': {}}
+                            parent['children'][name] = subtree
+                        stack.append((entry.path, subtree, counted))
+                        continue
+                    
+                    linked_dir = entry.is_symlink() and entry.is_dir()
+                    if parent is not None:
+                        if linked_dir:
+                            subtree = {'type': 'directory', 'children': {}}
+                            parent['children'][name] = subtree
+                            if not _links_into_ancestry(path, entry.path):
+                                stack.append((entry.path, subtree, False))
+                        else:
+                            parent['children'][name] = {'type': 'file'}
+                    
+                    # Like os.walk, the summary doesn't count symlinked directories
+                    if counted and not linked_dir:
+                        file_count += 1
+                        if not has_package_json and name == 'package.json':
+                            has_package_json = True
+                        # Lowercase only the 6-char prefix, not the whole name
+                        elif not has_readme and name[:6].lower() == 'readme':
+                            has_readme = True
         except PermissionError:
-            tree['error'] = 'Permission denied'
-        
-        return tree
+            if tree is not None:
+                tree['error'] = 'Permission denied'
+            if at_root:
+                error = 'Permission denied'
+        except OSError:
+            continue  # unreadable subdirectories are skipped, as os.walk does
     
+    stats = {'file_count': file_count, 'has_package_json': has_package_json,
+             'has_readme': has_readme, 'has_git': has_git}
+    if error is not None:
+        stats['error'] = error
+    return root, stats
+
+
+def get_file_tree(directory: str, ignore_patterns: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get a tree structure of files in a directory"""
     if not os.path.exists(directory):
         return {'type': 'directory', 'error': 'Directory does not exist'}
     
-    return build_tree(directory)
+    patterns = _DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else tuple(ignore_patterns)
+    tree, _ = _scan_tree(directory, patterns, build_tree=True, collect_info=False)
+    return tree
+
+
+async def get_file_tree_async(directory: str, ignore_patterns: Optional[List[str]] = None,
+                              max_concurrency: int = 32) -> Dict[str, Any]:
+    """
+    Get the same tree as get_file_tree, reading sibling directories concurrently
+    
+    Each os.scandir runs in a worker thread, so directory reads overlap; this
+    mainly pays off on cold caches and network filesystems.
+    
+    Args:
+        directory: Root directory to scan
+        ignore_patterns: Substrings of names to leave out (defaults as in get_file_tree)
+        max_concurrency: Maximum number of directories being read at the same time
+    """
+    if not os.path.exists(directory):
+        return {'type': 'directory', 'error': 'Directory does not exist'}
+    
+    patterns = _DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else tuple(ignore_patterns)
+    ignore_search = _compile_ignore_patterns(patterns)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    def list_directory(path: str) -> List[Tuple[str, str, bool, bool]]:
+        """(name, path, is a directory, descend into it), following symlinks like _scan_tree"""
+        listing = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if ignore_search is not None and ignore_search(entry.name) is not None:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    listing.append((entry.name, entry.path, True, True))
+                elif entry.is_symlink() and entry.is_dir():
+                    listing.append((entry.name, entry.path, True, not _links_into_ancestry(path, entry.path)))
+                else:
+                    listing.append((entry.name, entry.path, False, False))
+        return listing
+    
+    async def build_tree(path: str) -> Dict[str, Any]:
+        tree = {'type': 'directory', 'children': {}}
+        # Only the read itself holds the semaphore, so waiting on subtrees can't deadlock
+        async with semaphore:
+            try:
+                listing = await asyncio.to_thread(list_directory, path)
+            except PermissionError:
+                tree['error'] = 'Permission denied'
+                return tree
+            except OSError:
+                return tree
+        
+        children = tree['children']
+        subdirs = []
+        for name, entry_path, is_dir, descend in listing:
+            if descend:
+                children[name] = None  # placeholder keeps the listing order
+                subdirs.append((name, entry_path))
+            elif is_dir:
+                children[name] = {'type': 'directory', 'children': {}}
+            else:
+                children[name] = {'type': 'file'}
+        
+        subtrees = await asyncio.gather(*(build_tree(entry_path) for _, entry_path in subdirs))
+        for (name, _), subtree in zip(subdirs, subtrees):
+            children[name] = subtree
+        return tree
+    
+    return await build_tree(directory)
 
 
 def format_file_list(files: List[str], max_display: int = 20) -> str:
@@ -97,37 +396,54 @@ def format_file_list(files: List[str], max_display: int = 20) -> str:
     if len(files) <= max_display:
         return "\n".join(f"  - {file}" for file in sorted(files))
     else:
-        displayed = sorted(files)[:max_display]
+        # Only the first max_display names are shown, so a bounded heap beats a full sort
+        displayed = heapq.nsmallest(max_display, files)
         remaining = len(files) - max_display
         return "\n".join(f"  - {file}" for file in displayed) + f"\n  ... and {remaining} more files"
 
 
-def get_project_info(directory: str) -> Dict[str, Any]:
-    """Get basic information about a project directory"""
-    info = {
+def _empty_project_info(directory: str) -> Dict[str, Any]:
+    """Project info for a directory before its contents are scanned"""
+    exists = os.path.exists(directory)
+    return {
         'directory': directory,
-        'exists': os.path.exists(directory),
-        'is_directory': os.path.isdir(directory) if os.path.exists(directory) else False,
+        'exists': exists,
+        'is_directory': os.path.isdir(directory) if exists else False,
         'file_count': 0,
         'has_package_json': False,
         'has_readme': False,
         'has_git': False
     }
-    
+
+
+def get_project_info(directory: str) -> Dict[str, Any]:
+    """Get basic information about a project directory"""
+    info = _empty_project_info(directory)
     if not info['is_directory']:
         return info
     
-    try:
-        files = []
-        for root, dirs, filenames in os.walk(directory):
-            files.extend(filenames)
-        
-        info['file_count'] = len(files)
-        info['has_package_json'] = 'package.json' in files
-        info['has_readme'] = any(f.lower().startswith('readme') for f in files)
-        info['has_git'] = os.path.exists(os.path.join(directory, '.git'))
-        
-    except PermissionError:
-        info['error'] = 'Permission denied'
+    _, stats = _scan_tree(directory, (), build_tree=False, collect_info=True)
+    info.update(stats)
+    return info
+
+
+def scan_project(directory: str, ignore_patterns: Optional[List[str]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Get both the file tree and the project info from a single directory walk
+    
+    Equivalent to (get_file_tree(directory, ignore_patterns), get_project_info(directory)),
+    but every directory is read only once.
+    
+    Returns:
+        Tuple of (file tree, project info)
+    """
+    info = _empty_project_info(directory)
+    if not info['exists']:
+        return {'type': 'directory', 'error': 'Directory does not exist'}, info
+    if not info['is_directory']:
+        return get_file_tree(directory, ignore_patterns), info
     
-    return info
\ No newline at end of file
+    patterns = _DEFAULT_IGNORE_PATTERNS if ignore_patterns is None else tuple(ignore_patterns)
+    tree, stats = _scan_tree(directory, patterns, build_tree=True, collect_info=True)
+    info.update(stats)
+    return tree, info
@@ -5,10 +5,17 @@ import subprocess
 import json
 import dataclasses
 import threading
+from collections import OrderedDict
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     import anyio
     from claude_code_sdk import query, ClaudeCodeOptions
@@ -22,15 +29,115 @@ from master_workflow import MasterWorkflow
 
 load_dotenv()
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, for large SDK message payloads"""
+    
+    # Same default as DefaultJSONProvider, so responses keep their key order
+    sort_keys = True
+    
+    def dumps(self, obj, **kwargs):
+        # Dates pass through to Flask's converter so they stay in http_date format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2  # e.g. the templates' tojson(indent=2)
+        # Types orjson doesn't know (e.g. Markup) go through Flask's usual conversions
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class UUIDPool:
+    """Hands out random (version 4) UUIDs from a pre-fetched block of os.urandom bytes"""
+    
+    def __init__(self, batch_size=1024):
+        self._batch_bytes = 16 * batch_size
+        self._slab = b''
+        self._offset = 0
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def next_str(self):
+        with self._lock:
+            # Refill after a fork too, so worker processes never share a block
+            if self._offset >= len(self._slab) or self._pid != os.getpid():
+                self._slab = os.urandom(self._batch_bytes)
+                self._offset = 0
+                self._pid = os.getpid()
+            chunk = self._slab[self._offset:self._offset + 16]
+            self._offset += 16
+        return str(uuid.UUID(bytes=chunk, version=4))
+
+_uuid_pool = UUIDPool()
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+if orjson is not None:
+    # jsonify and request.get_json both go through app.json
+    app.json = OrjsonProvider(app)
+
+# Templates only change on deploy, so skip Jinja's per-render mtime check (even under
+# debug=True) unless TEMPLATES_AUTO_RELOAD is set, and compile them all up front
+app.config['TEMPLATES_AUTO_RELOAD'] = os.getenv('TEMPLATES_AUTO_RELOAD', '').lower() in ('1', 'true', 'yes')
+app.jinja_env.auto_reload = app.config['TEMPLATES_AUTO_RELOAD']
+for _template_name in app.jinja_env.list_templates(extensions=['html']):
+    app.jinja_env.get_template(_template_name)
+
+class SessionStore:
+    """In-memory sessions, evicting the least recently used once max_sessions is reached"""
+    
+    def __init__(self, max_sessions=1024):
+        self.max_sessions = max_sessions
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __setitem__(self, session_id, session_data):
+        with self._lock:
+            self._data[session_id] = session_data
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.max_sessions:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def get(self, session_id, default=None):
+        with self._lock:
+            session_data = self._data.get(session_id, default)
+            if session_id in self._data:
+                self._data.move_to_end(session_id)
+            return session_data
+    
+    def __len__(self):
+        return len(self._data)
 
-# Store sessions in memory (use Redis or database in production)
-sessions = {}
+# Store sessions in memory (use Redis or database in production); bounded so
+# full message transcripts don't accumulate for the life of the process
+sessions = SessionStore(max_sessions=int(os.getenv('MAX_SESSIONS', '1024')))
 
 # Store workflow progress in memory (use Redis or database in production)
 workflows = {}
 
+# Markdown files the agent dashboards may request, keyed by agent then by public file name
+AGENT_FILE_MAPPINGS = {
+    'product-manager': {
+        'SPEC.md': os.path.join('project', 'SPEC.md')
+    },
+    'engineering-manager': {
+        'frontend-CLAUDE.md': os.path.join('project', 'frontend', 'CLAUDE.md'),
+        'backend-CLAUDE.md': os.path.join('project', 'backend', 'CLAUDE.md')
+    },
+    'frontend-engineer': {
+        'project-structure.md': os.path.join('project', 'frontend', 'README.md')
+    },
+    'backend-engineer': {
+        'project-structure.md': os.path.join('project', 'backend', 'README.md')
+    },
+    'testing-engineer': {
+        'fixes.md': os.path.join('project', 'testing', 'analysis', 'fixes.MD')
+    }
+}
+
 def run_master_workflow_async(user_request, workflow_id):
     """Run master workflow in background thread with simulated progress"""
     import time
@@ -197,14 +304,32 @@ def run_master_workflow_async(user_request, workflow_id):
             'failed_at': datetime.now().isoformat()
         })
 
+# One event loop, running in a daemon thread, shared by every request. It is
+# started on first use, so the debug reloader's parent process never creates one.
+# A blocking call in a coroutine stalls every in-flight request, so blocking work
+# goes through asyncio.to_thread.
+_BG_LOOP = None
+_BG_LOOP_LOCK = threading.Lock()
+
+def _background_loop():
+    """Return the shared background event loop, starting it if needed"""
+    global _BG_LOOP
+    with _BG_LOOP_LOCK:
+        if _BG_LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='asyncio-loop', daemon=True).start()
+            _BG_LOOP = loop
+    return _BG_LOOP
+
 def run_async(coro):
-    """Helper function to run async code in Flask"""
+    """Helper function to run async code in Flask (blocks until the coroutine finishes)"""
     try:
-        loop = asyncio.get_event_loop()
+        asyncio.get_running_loop()
     except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(coro)
+        return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+    # Blocking here would deadlock the shared loop if this thread is running it
+    coro.close()
+    raise RuntimeError("run_async() cannot be called from a running event loop; await the coroutine instead")
 
 async def query_claude_code_sdk(prompt, options=None):
     """Query Claude Code SDK with error handling"""
@@ -437,7 +562,8 @@ async def run_dynamic_agent_workflow(user_request):
             pm_messages = await query_claude_code_sdk(pm_prompt, ClaudeCodeOptions(max_turns=3))
         else:
             # Fallback to CLI method
-            pm_messages = query_claude_code_cli(pm_prompt, 3)
+            # The CLI call blocks, so keep it off the shared event loop
+            pm_messages = await asyncio.to_thread(query_claude_code_cli, pm_prompt, 3)
         
         # Extract PM response - handle different message formats
         pm_response_text = ""
@@ -480,321 +606,7 @@ async def run_dynamic_agent_workflow(user_request):
             em_messages = await query_claude_code_sdk(em_prompt, ClaudeCodeOptions(max_turns=3))
         else:
             # Fallback to CLI method
-            em_messages = query_claude_code_cli(em_prompt, 3)
-        
-        # Extract EM response - handle different message formats
-        em_response_text = ""
-        if em_messages:
-            # For SDK, find the ResultMessage (last message should be ResultMessage)
-            if SDK_AVAILABLE:
-                # Look for ResultMessage in the messages
-                result_messages = [msg for msg in em_messages if hasattr(msg, 'result')]
-                if result_messages:
-                    em_response_text = result_messages[-1].result
-                else:
-                    em_response_text = str(em_messages[-1])
-            else:
-                # Handle CLI response format
-                last_message = em_messages[-1]
-                if isinstance(last_message, dict):
-                    em_response_text = last_message.get('result', last_message.get('content', str(last_message)))
-                else:
-                    em_response_text = str(last_message)
-        
-        # Store EM response as markdown
-        em_response = None
-        try:
-            if em_response_text is None:
-                em_response = {"error": "EM response text is None", "raw": "None"}
-            elif not isinstance(em_response_text, str):
-                em_response_text = str(em_response_text)
-                em_response = {"error": "EM response not a string", "raw": em_response_text}
-            elif em_response_text.strip():
-                em_response = {
-                    "agent_role": "Engineering Manager",
-                    "markdown_content": em_response_text,
-                    "content_type": "markdown"
-                }
-            else:
-                em_response = {"error": "Empty EM response", "raw": em_response_text}
-        except Exception as e:
-            em_response = {"error": f"EM parsing error: {str(e)}", "raw": em_response_text}
-            
-        return {
-            'success': True,
-            'pm_response': pm_response,
-            'em_response': em_response,
-            'pm_raw': pm_response_text,
-            'em_raw': em_response_text
-        }
-        
-    except Exception as e:
-        return {
-            'success': False,
-            'error': str(e),
-            'pm_response': {"error": f"Workflow error: {str(e)}"},
-            'em_response': {"error": f"Workflow error: {str(e)}"}
-        }
-
-def run_dynamic_agent_workflow_sync(user_request):
-    """Synchronous wrapper for the async agent workflow"""
-    return run_async(run_dynamic_agent_workflow(user_request))
-
-def create_pm_agent_prompt(user_request):
-    """Create a Product Manager agent prompt for Claude Code SDK"""
-    return f"""
-You are an experienced Product Manager at a tech company. A stakeholder has come to you with this request:
-
-"{user_request}"
-
-Please analyze this request and provide a comprehensive Product Manager response in **Markdown format**. Structure your response as follows:
-
-# Product Manager Analysis
-
-## 📋 Problem Analysis
-
-### Problem Statement
-[Clear problem statement based on the request]
-
-### Target Users
-- [Target user persona 1]
-- [Target user persona 2]
-- [Additional personas as needed]
-
-### Business Goals
-- [Business objective 1]
-- [Business objective 2]
-- [Additional goals as needed]
-
-### Success Metrics
-- [Measurable success criterion 1]
-- [Measurable success criterion 2]
-- [Additional metrics as needed]
-
-## 📝 User Stories
-
-### US-001: [Story Title]
-**As a** [user type], **I want** [goal] **so that** [benefit]
-
-**Priority:** High/Medium/Low | **Story Points:** [number] | **Business Value:** [explanation]
-
-**Acceptance Criteria:**
-- [Criteria 1]
-- [Criteria 2]
-- [Additional criteria as needed]
-
-[Repeat for additional user stories]
-
-## 📋 Requirements
-
-### Functional Requirements
-- [Functional requirement 1]
-- [Functional requirement 2]
-- [Additional requirements as needed]
-
-### Non-Functional Requirements
-- [Non-functional requirement 1]
-- [Non-functional requirement 2]
-- [Additional requirements as needed]
-
-### Constraints
-- [Constraint 1]
-- [Constraint 2]
-
-### Assumptions
-- [Assumption 1]
-- [Assumption 2]
-
-### Dependencies
-- [Dependency 1]
-- [Dependency 2]
-
-## ⚠️ Risk Assessment
-
-### [Risk Name 1]
-**Impact:** High/Medium/Low | **Probability:** High/Medium/Low
-**Mitigation:** [Mitigation strategy]
-
-[Repeat for additional risks]
-
-## 🎯 Next Steps
-- [Next step 1]
-- [Next step 2]
-- [Additional steps as needed]
-
-## ❓ Questions for Engineering Team
-- [Technical question 1]
-- [Technical question 2]
-- [Additional questions as needed]
-
-Focus on creating realistic, detailed user stories and requirements that an engineering team can work with. Be thorough but practical.
-"""
-
-def create_em_agent_prompt(user_request, pm_response):
-    """Create an Engineering Manager agent prompt for Claude Code SDK"""
-    # Convert pm_response to string representation for the prompt
-    pm_analysis = str(pm_response) if pm_response else "PM analysis not available"
-    
-    return f"""
-You are an experienced Engineering Manager at a tech company. The Product Manager has analyzed a stakeholder request and provided their analysis. Now you need to create the technical implementation plan.
-
-Original Request: "{user_request}"
-
-Product Manager Analysis:
-{pm_analysis}
-
-Please provide a comprehensive Engineering Manager response in **Markdown format**. Structure your response as follows:
-
-# Engineering Manager Technical Plan
-
-## 🏗️ Technical Architecture
-
-### Architecture Overview
-[High-level system architecture description]
-
-### Technology Stack
-- **Frontend:** [Recommended frontend technology]
-- **Backend:** [Recommended backend technology]
-- **Database:** [Recommended database solution]
-- **Infrastructure:** [Recommended infrastructure approach]
-- **Additional Tools:**
-  - [Tool/Service 1]
-  - [Tool/Service 2]
-  - [Additional tools as needed]
-
-### System Components
-
-#### [Component Name 1]
-**Purpose:** [What this component does]
-**Technology:** [Specific technology choice]
-**Responsibilities:**
-- [Responsibility 1]
-- [Responsibility 2]
-- [Additional responsibilities as needed]
-
-[Repeat for additional components]
-
-## 📅 Implementation Plan
-
-### Development Phases
-
-#### Phase 1: [Phase Name]
-**Duration:** [Estimated duration]
-**Tasks:**
-- [Major task 1]
-- [Major task 2]
-- [Additional tasks as needed]
-
-**Deliverables:**
-- [Deliverable 1]
-- [Deliverable 2]
-
-**Dependencies:**
-- [Dependency 1]
-- [Dependency 2]
-
-[Repeat for additional phases]
-
-### Team Structure
-**Recommended Team Size:** [Number] people
-
-#### [Role Name 1] ([Count])
-**Responsibilities:**
-- [Responsibility 1]
-- [Responsibility 2]
-
-[Repeat for additional roles]
-
-### Timeline Estimates
-- **MVP Estimate:** [Time estimate]
-- **Full Product Estimate:** [Time estimate]
-- **Key Milestones:**
-  - [Milestone 1]
-  - [Milestone 2]
-  - [Additional milestones as needed]
-
-## ⚠️ Technical Risks
-
-### [Risk Name 1]
-**Impact:** High/Medium/Low | **Probability:** High/Medium/Low
-**Mitigation:** [Technical mitigation strategy]
-
-[Repeat for additional risks]
-
-## 🏗️ Infrastructure Requirements
-- [Infrastructure need 1]
-- [Infrastructure need 2]
-- [Additional requirements as needed]
-
-## ✅ Quality Gates
-- [Quality checkpoint 1]
-- [Quality checkpoint 2]
-- [Additional checkpoints as needed]
-
-## ❓ Questions for Product Manager
-- [Clarifying question 1]
-- [Clarifying question 2]
-- [Additional questions as needed]
-
-Base your recommendations on modern software engineering best practices and consider scalability, maintainability, and team capabilities.
-"""
-
-async def run_dynamic_agent_workflow(user_request):
-    """Run dynamic PM -> EM workflow using Claude Code SDK"""
-    
-    try:
-        # Step 1: Get PM analysis from Claude
-        pm_prompt = create_pm_agent_prompt(user_request)
-        
-        if SDK_AVAILABLE:
-            # PM queries may need multiple turns for complex analysis
-            pm_messages = await query_claude_code_sdk(pm_prompt, ClaudeCodeOptions(max_turns=3))
-        else:
-            # Fallback to CLI method
-            pm_messages = query_claude_code_cli(pm_prompt, 3)
-        
-        # Extract PM response - handle different message formats
-        pm_response_text = ""
-        if pm_messages:
-            # For SDK, find the ResultMessage (last message should be ResultMessage)
-            if SDK_AVAILABLE:
-                # Look for ResultMessage in the messages
-                result_messages = [msg for msg in pm_messages if hasattr(msg, 'result')]
-                if result_messages:
-                    pm_response_text = result_messages[-1].result
-                else:
-                    pm_response_text = str(pm_messages[-1])
-            else:
-                # Handle CLI response format
-                last_message = pm_messages[-1]
-                if isinstance(last_message, dict):
-                    pm_response_text = last_message.get('result', last_message.get('content', str(last_message)))
-                else:
-                    pm_response_text = str(last_message)
-        
-        # Store PM response as markdown
-        pm_response = None
-        try:
-            if pm_response_text and pm_response_text.strip():
-                pm_response = {
-                    "agent_role": "Product Manager",
-                    "markdown_content": pm_response_text,
-                    "content_type": "markdown"
-                }
-            else:
-                pm_response = {"error": "Empty PM response", "raw": pm_response_text}
-        except Exception as e:
-            pm_response = {"error": f"PM parsing error: {str(e)}", "raw": pm_response_text}
-        
-        # Step 2: Get EM analysis from Claude using PM output
-        em_prompt = create_em_agent_prompt(user_request, pm_response)
-        
-        if SDK_AVAILABLE:
-            # EM queries may need more turns due to tool usage
-            em_messages = await query_claude_code_sdk(em_prompt, ClaudeCodeOptions(max_turns=3))
-        else:
-            # Fallback to CLI method
-            em_messages = query_claude_code_cli(em_prompt, 3)
+            em_messages = await asyncio.to_thread(query_claude_code_cli, em_prompt, 3)
         
         # Extract EM response - handle different message formats
         em_response_text = ""
@@ -878,7 +690,7 @@ def start_workflow():
             return jsonify({'error': 'User request cannot be empty'}), 400
         
         # Generate workflow ID
-        workflow_id = str(uuid.uuid4())
+        workflow_id = _uuid_pool.next_str()
         
         # Initialize workflow tracking
         workflows[workflow_id] = {
@@ -1003,7 +815,7 @@ def handle_query():
             return jsonify({'error': 'Prompt is required'}), 400
         
         # Create session
-        session_id = str(uuid.uuid4())
+        session_id = _uuid_pool.next_str()
         
         if query_type == 'agents':
             # Run agent workflow
@@ -1047,7 +859,7 @@ def api_agents():
             'success': workflow_result.get('success', False),
             'pm_response': workflow_result.get('pm_response', {}),
             'em_response': workflow_result.get('em_response', {}),
-            'session_id': str(uuid.uuid4())
+            'session_id': _uuid_pool.next_str()
         })
         
     except Exception as e:
@@ -1081,7 +893,7 @@ def api_query():
         return jsonify({
             'success': True,
             'messages': [msg.__dict__ if hasattr(msg, '__dict__') else str(msg) for msg in messages],
-            'session_id': str(uuid.uuid4())
+            'session_id': _uuid_pool.next_str()
         })
         
     except Exception as e:
@@ -1090,7 +902,12 @@ def api_query():
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'service': 'Flask Claude Code App'})
+    return jsonify({
+        'status': 'healthy',
+        'service': 'Flask Claude Code App',
+        'sessions': len(sessions),
+        'session_evictions': sessions.evictions
+    })
 
 @app.route('/debug/claude-format')
 def debug_claude_format():
@@ -1138,35 +955,15 @@ def debug_test_agent():
 def get_markdown_file(agent, filename):
     """API endpoint to serve markdown file content from agents"""
     try:
-        # Define valid agent directories and their corresponding file mappings
-        agent_file_mappings = {
-            'product-manager': {
-                'SPEC.md': os.path.join('project', 'SPEC.md')
-            },
-            'engineering-manager': {
-                'frontend-CLAUDE.md': os.path.join('project', 'frontend', 'CLAUDE.md'),
-                'backend-CLAUDE.md': os.path.join('project', 'backend', 'CLAUDE.md')
-            },
-            'frontend-engineer': {
-                'project-structure.md': os.path.join('project', 'frontend', 'README.md')
-            },
-            'backend-engineer': {
-                'project-structure.md': os.path.join('project', 'backend', 'README.md')
-            },
-            'testing-engineer': {
-                'fixes.md': os.path.join('project', 'testing', 'analysis', 'fixes.MD')
-            }
-        }
-        
         # Validate agent and filename
-        if agent not in agent_file_mappings:
+        if agent not in AGENT_FILE_MAPPINGS:
             return jsonify({'error': f'Invalid agent: {agent}'}), 400
         
-        if filename not in agent_file_mappings[agent]:
+        if filename not in AGENT_FILE_MAPPINGS[agent]:
             return jsonify({'error': f'Invalid filename for agent {agent}: {filename}'}), 400
         
         # Get the file path
-        file_path = agent_file_mappings[agent][filename]
+        file_path = AGENT_FILE_MAPPINGS[agent][filename]
         
         # Check if file exists
         if not os.path.exists(file_path):
@@ -378,320 +378,6 @@ def run_dynamic_agent_workflow_sync(user_request):
     """Synchronous wrapper for the async agent workflow"""
     return run_async(run_dynamic_agent_workflow(user_request))
 
-def create_pm_agent_prompt(user_request):
-    """Create a Product Manager agent prompt for Claude Code SDK"""
-    return f"""
-You are an experienced Product Manager at a tech company. A stakeholder has come to you with this request:
-
-"{user_request}"
-
-Please analyze this request and provide a comprehensive Product Manager response in **Markdown format**. Structure your response as follows:
-
-# Product Manager Analysis
-
-## 📋 Problem Analysis
-
-### Problem Statement
-[Clear problem statement based on the request]
-
-### Target Users
-- [Target user persona 1]
-- [Target user persona 2]
-- [Additional personas as needed]
-
-### Business Goals
-- [Business objective 1]
-- [Business objective 2]
-- [Additional goals as needed]
-
-### Success Metrics
-- [Measurable success criterion 1]
-- [Measurable success criterion 2]
-- [Additional metrics as needed]
-
-## 📝 User Stories
-
-### US-001: [Story Title]
-**As a** [user type], **I want** [goal] **so that** [benefit]
-
-**Priority:** High/Medium/Low | **Story Points:** [number] | **Business Value:** [explanation]
-
-**Acceptance Criteria:**
-- [Criteria 1]
-- [Criteria 2]
-- [Additional criteria as needed]
-
-[Repeat for additional user stories]
-
-## 📋 Requirements
-
-### Functional Requirements
-- [Functional requirement 1]
-- [Functional requirement 2]
-- [Additional requirements as needed]
-
-### Non-Functional Requirements
-- [Non-functional requirement 1]
-- [Non-functional requirement 2]
-- [Additional requirements as needed]
-
-### Constraints
-- [Constraint 1]
-- [Constraint 2]
-
-### Assumptions
-- [Assumption 1]
-- [Assumption 2]
-
-### Dependencies
-- [Dependency 1]
-- [Dependency 2]
-
-## ⚠️ Risk Assessment
-
-### [Risk Name 1]
-**Impact:** High/Medium/Low | **Probability:** High/Medium/Low
-**Mitigation:** [Mitigation strategy]
-
-[Repeat for additional risks]
-
-## 🎯 Next Steps
-- [Next step 1]
-- [Next step 2]
-- [Additional steps as needed]
-
-## ❓ Questions for Engineering Team
-- [Technical question 1]
-- [Technical question 2]
-- [Additional questions as needed]
-
-Focus on creating realistic, detailed user stories and requirements that an engineering team can work with. Be thorough but practical.
-"""
-
-def create_em_agent_prompt(user_request, pm_response):
-    """Create an Engineering Manager agent prompt for Claude Code SDK"""
-    # Convert pm_response to string representation for the prompt
-    pm_analysis = str(pm_response) if pm_response else "PM analysis not available"
-    
-    return f"""
-You are an experienced Engineering Manager at a tech company. The Product Manager has analyzed a stakeholder request and provided their analysis. Now you need to create the technical implementation plan.
-
-Original Request: "{user_request}"
-
-Product Manager Analysis:
-{pm_analysis}
-
-Please provide a comprehensive Engineering Manager response in **Markdown format**. Structure your response as follows:
-
-# Engineering Manager Technical Plan
-
-## 🏗️ Technical Architecture
-
-### Architecture Overview
-[High-level system architecture description]
-
-### Technology Stack
-- **Frontend:** [Recommended frontend technology]
-- **Backend:** [Recommended backend technology]
-- **Database:** [Recommended database solution]
-- **Infrastructure:** [Recommended infrastructure approach]
-- **Additional Tools:**
-  - [Tool/Service 1]
-  - [Tool/Service 2]
-  - [Additional tools as needed]
-
-### System Components
-
-#### [Component Name 1]
-**Purpose:** [What this component does]
-**Technology:** [Specific technology choice]
-**Responsibilities:**
-- [Responsibility 1]
-- [Responsibility 2]
-- [Additional responsibilities as needed]
-
-[Repeat for additional components]
-
-## 📅 Implementation Plan
-
-### Development Phases
-
-#### Phase 1: [Phase Name]
-**Duration:** [Estimated duration]
-**Tasks:**
-- [Major task 1]
-- [Major task 2]
-- [Additional tasks as needed]
-
-**Deliverables:**
-- [Deliverable 1]
-- [Deliverable 2]
-
-**Dependencies:**
-- [Dependency 1]
-- [Dependency 2]
-
-[Repeat for additional phases]
-
-### Team Structure
-**Recommended Team Size:** [Number] people
-
-#### [Role Name 1] ([Count])
-**Responsibilities:**
-- [Responsibility 1]
-- [Responsibility 2]
-
-[Repeat for additional roles]
-
-### Timeline Estimates
-- **MVP Estimate:** [Time estimate]
-- **Full Product Estimate:** [Time estimate]
-- **Key Milestones:**
-  - [Milestone 1]
-  - [Milestone 2]
-  - [Additional milestones as needed]
-
-## ⚠️ Technical Risks
-
-### [Risk Name 1]
-**Impact:** High/Medium/Low | **Probability:** High/Medium/Low
-**Mitigation:** [Technical mitigation strategy]
-
-[Repeat for additional risks]
-
-## 🏗️ Infrastructure Requirements
-- [Infrastructure need 1]
-- [Infrastructure need 2]
-- [Additional requirements as needed]
-
-## ✅ Quality Gates
-- [Quality checkpoint 1]
-- [Quality checkpoint 2]
-- [Additional checkpoints as needed]
-
-## ❓ Questions for Product Manager
-- [Clarifying question 1]
-- [Clarifying question 2]
-- [Additional questions as needed]
-
-Base your recommendations on modern software engineering best practices and consider scalability, maintainability, and team capabilities.
-"""
-
-async def run_dynamic_agent_workflow(user_request):
-    """Run dynamic PM -> EM workflow using Claude Code SDK"""
-    
-    try:
-        # Step 1: Get PM analysis from Claude
-        pm_prompt = create_pm_agent_prompt(user_request)
-        
-        if SDK_AVAILABLE:
-            # PM queries may need multiple turns for complex analysis
-            pm_messages = await query_claude_code_sdk(pm_prompt, ClaudeCodeOptions(max_turns=3))
-        else:
-            # Fallback to CLI method
-            pm_messages = query_claude_code_cli(pm_prompt, 3)
-        
-        # Extract PM response - handle different message formats
-        pm_response_text = ""
-        if pm_messages:
-            # For SDK, find the ResultMessage (last message should be ResultMessage)
-            if SDK_AVAILABLE:
-                # Look for ResultMessage in the messages
-                result_messages = [msg for msg in pm_messages if hasattr(msg, 'result')]
-                if result_messages:
-                    pm_response_text = result_messages[-1].result
-                else:
-                    pm_response_text = str(pm_messages[-1])
-            else:
-                # Handle CLI response format
-                last_message = pm_messages[-1]
-                if isinstance(last_message, dict):
-                    pm_response_text = last_message.get('result', last_message.get('content', str(last_message)))
-                else:
-                    pm_response_text = str(last_message)
-        
-        # Store PM response as markdown
-        pm_response = None
-        try:
-            if pm_response_text and pm_response_text.strip():
-                pm_response = {
-                    "agent_role": "Product Manager",
-                    "markdown_content": pm_response_text,
-                    "content_type": "markdown"
-                }
-            else:
-                pm_response = {"error": "Empty PM response", "raw": pm_response_text}
-        except Exception as e:
-            pm_response = {"error": f"PM parsing error: {str(e)}", "raw": pm_response_text}
-        
-        # Step 2: Get EM analysis from Claude using PM output
-        em_prompt = create_em_agent_prompt(user_request, pm_response)
-        
-        if SDK_AVAILABLE:
-            # EM queries may need more turns due to tool usage
-            em_messages = await query_claude_code_sdk(em_prompt, ClaudeCodeOptions(max_turns=3))
-        else:
-            # Fallback to CLI method
-            em_messages = query_claude_code_cli(em_prompt, 3)
-        
-        # Extract EM response - handle different message formats
-        em_response_text = ""
-        if em_messages:
-            # For SDK, find the ResultMessage (last message should be ResultMessage)
-            if SDK_AVAILABLE:
-                # Look for ResultMessage in the messages
-                result_messages = [msg for msg in em_messages if hasattr(msg, 'result')]
-                if result_messages:
-                    em_response_text = result_messages[-1].result
-                else:
-                    em_response_text = str(em_messages[-1])
-            else:
-                # Handle CLI response format
-                last_message = em_messages[-1]
-                if isinstance(last_message, dict):
-                    em_response_text = last_message.get('result', last_message.get('content', str(last_message)))
-                else:
-                    em_response_text = str(last_message)
-        
-        # Store EM response as markdown
-        em_response = None
-        try:
-            if em_response_text is None:
-                em_response = {"error": "EM response text is None", "raw": "None"}
-            elif not isinstance(em_response_text, str):
-                em_response_text = str(em_response_text)
-                em_response = {"error": "EM response not a string", "raw": em_response_text}
-            elif em_response_text.strip():
-                em_response = {
-                    "agent_role": "Engineering Manager",
-                    "markdown_content": em_response_text,
-                    "content_type": "markdown"
-                }
-            else:
-                em_response = {"error": "Empty EM response", "raw": em_response_text}
-        except Exception as e:
-            em_response = {"error": f"EM parsing error: {str(e)}", "raw": em_response_text}
-            
-        return {
-            'success': True,
-            'pm_response': pm_response,
-            'em_response': em_response,
-            'pm_raw': pm_response_text,
-            'em_raw': em_response_text
-        }
-        
-    except Exception as e:
-        return {
-            'success': False,
-            'error': str(e),
-            'pm_response': {"error": f"Workflow error: {str(e)}"},
-            'em_response': {"error": f"Workflow error: {str(e)}"}
-        }
-
-def run_dynamic_agent_workflow_sync(user_request):
-    """Synchronous wrapper for the async agent workflow"""
-    return run_async(run_dynamic_agent_workflow(user_request))
-
 @app.route('/')
 def index():
     """Main page with query form"""
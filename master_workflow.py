@@ -18,6 +18,7 @@ import os
 import sys
 import time
 import json
+import logging
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -485,6 +486,9 @@ class MasterWorkflow:
 
 def main():
     """Demo function to test the master workflow"""
+    # Show the agents' progress messages (e.g. server startup) on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     print("🚀 Master Workflow Demo")
     print("=" * 60)
     print("This will run the complete development pipeline:")
@@ -527,9 +531,8 @@ def main():
     # Save results to file
     results_file = f"workflow_results_{workflow.workflow_id}.json"
     with open(results_file, 'w') as f:
-        # Convert any non-serializable objects to strings
-        serializable_result = json.loads(json.dumps(result, default=str))
-        json.dump(serializable_result, f, indent=2)
+        # Convert any non-serializable objects (SDK messages, etc.) to strings in one pass
+        json.dump(result, f, indent=2, default=str)
     
     print(f"\n💾 Detailed results saved to: {results_file}")
 
@@ -0,0 +1,43 @@
+"""
+Tests for the Engineering Manager's local alignment pre-check
+"""
+
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(REPO_DIR, 'project')
+sys.path.insert(0, REPO_DIR)
+
+try:
+    from agents.engineering_manager import _alignment_hints
+except ImportError:  # the agents need the Claude Code SDK and python-dotenv
+    _alignment_hints = None
+
+
+def _read_instructions(team: str) -> str:
+    with open(os.path.join(PROJECT_DIR, team, 'CLAUDE.md'), encoding='utf-8') as f:
+        return f.read()
+
+
+@unittest.skipIf(_alignment_hints is None, "engineering_manager not importable")
+class AlignmentPrecheckTest(unittest.TestCase):
+    def test_aligned_project_has_no_hints(self):
+        hints = _alignment_hints(_read_instructions('frontend'), _read_instructions('backend'))
+        self.assertEqual(hints, [])
+    
+    def test_ports_ignore_timestamps(self):
+        hints = _alignment_hints(
+            "Call http://localhost:8000/api. Dev server: **Port**: 3001",
+            "Start with --port 8000, allow localhost:3001. Example: 2024-01-01T12:00:00Z"
+        )
+        self.assertEqual(hints, [])
+    
+    def test_reports_endpoint_seen_on_one_side(self):
+        hints = _alignment_hints("GET /api/todos/{id}", "GET /api/todos/:todo_id\nDELETE /api/todos/{todo_id}")
+        self.assertEqual(hints, ["- Endpoints seen only in backend/CLAUDE.md: DELETE /api/todos/{}"])
+
+
+if __name__ == '__main__':
+    unittest.main()